@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     # Database
     MONGO_URL: str = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
     DB_NAME: str = os.environ.get('DB_NAME', 'corpinfo_db')
+    # Create missing indexes (core/indexes.py) on startup
+    MONGO_ENSURE_INDEXES: bool = os.environ.get('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
     
     # Security
     SECRET_KEY: str = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
@@ -19,6 +21,20 @@ class Settings(BaseSettings):
     
     # Groq API
     GROQ_API_KEY: str = os.environ.get('GROQ_API_KEY', '')
+    # Alternative endpoint, e.g. the local stub in llm_stub.py for benchmarks
+    GROQ_BASE_URL: str = os.environ.get('GROQ_BASE_URL', '')
+    AI_TIMEOUT_SECONDS: float = float(os.environ.get('AI_TIMEOUT_SECONDS', '8'))
+    AI_MAX_CONCURRENCY: int = int(os.environ.get('AI_MAX_CONCURRENCY', '8'))
+    # Bulk jobs enrich companies in micro-batches of up to AI_BATCH_SIZE,
+    # collected for at most AI_BATCH_WINDOW_SECONDS
+    AI_BATCH_SIZE: int = int(os.environ.get('AI_BATCH_SIZE', '10'))
+    AI_BATCH_WINDOW_SECONDS: float = float(os.environ.get('AI_BATCH_WINDOW_SECONDS', '0.5'))
+    AI_BATCH_TIMEOUT_SECONDS: float = float(os.environ.get('AI_BATCH_TIMEOUT_SECONDS', '30'))
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = os.environ.get('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_TTL_DAYS: int = int(os.environ.get('LLM_CACHE_TTL_DAYS', '30'))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '1024'))
     
     # Razorpay
     RAZORPAY_KEY_ID: str = os.environ.get('RAZORPAY_KEY_ID', '')
@@ -37,6 +53,73 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     
+    # Crawler HTTP client
+    HTTP_MAX_CONNECTIONS: int = int(os.environ.get('HTTP_MAX_CONNECTIONS', '200'))
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(os.environ.get('HTTP_MAX_CONNECTIONS_PER_HOST', '8'))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.environ.get('HTTP_KEEPALIVE_TIMEOUT', '30'))
+    HTTP_DNS_CACHE_TTL: int = int(os.environ.get('HTTP_DNS_CACHE_TTL', '300'))
+    HTTP_DNS_NEGATIVE_TTL: int = int(os.environ.get('HTTP_DNS_NEGATIVE_TTL', '600'))
+    HTTP_DNS_CACHE_MAX_ENTRIES: int = int(os.environ.get('HTTP_DNS_CACHE_MAX_ENTRIES', '50000'))
+    HTTP_TIMEOUT_SECONDS: float = float(os.environ.get('HTTP_TIMEOUT_SECONDS', '10'))
+    HTTP_MAX_RESPONSE_BYTES: int = int(os.environ.get('HTTP_MAX_RESPONSE_BYTES', str(1024 * 1024)))
+    HTTP_READ_CHUNK_SIZE: int = int(os.environ.get('HTTP_READ_CHUNK_SIZE', str(16 * 1024)))
+    HTTP_CACHE_ENABLED: bool = os.environ.get('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+    HTTP_CACHE_TTL_DAYS: int = int(os.environ.get('HTTP_CACHE_TTL_DAYS', '30'))
+    
+    # Crawler politeness
+    HOST_RATE_PER_SECOND: float = float(os.environ.get('HOST_RATE_PER_SECOND', '2'))
+    HOST_BURST: float = float(os.environ.get('HOST_BURST', '4'))
+    HOST_RATE_OVERRIDES: str = os.environ.get('HOST_RATE_OVERRIDES', 'linkedin.com=0.5,news.google.com=1')
+    # robots.txt is enforced for every crawler unless its class name is
+    # listed in ROBOTS_EXEMPT_SOURCES. linkedin.com disallows all generic
+    # user agents, so LinkedInCrawler fetches nothing unless it is exempted
+    ROBOTS_RESPECT: bool = os.environ.get('ROBOTS_RESPECT', 'true').lower() == 'true'
+    ROBOTS_EXEMPT_SOURCES: str = os.environ.get('ROBOTS_EXEMPT_SOURCES', '')
+    ROBOTS_CACHE_TTL_SECONDS: int = int(os.environ.get('ROBOTS_CACHE_TTL_SECONDS', '3600'))
+    ROBOTS_CACHE_MAX_ENTRIES: int = int(os.environ.get('ROBOTS_CACHE_MAX_ENTRIES', '10000'))
+    
+    # Website crawler frontier (pages include the homepage)
+    WEBSITE_CRAWL_MAX_PAGES: int = int(os.environ.get('WEBSITE_CRAWL_MAX_PAGES', '4'))
+    WEBSITE_CRAWL_DOMAIN_CONCURRENCY: int = int(os.environ.get('WEBSITE_CRAWL_DOMAIN_CONCURRENCY', '3'))
+    
+    # Company name to domain discovery
+    DOMAIN_CANDIDATE_TLDS: str = os.environ.get('DOMAIN_CANDIDATE_TLDS', 'com,io,co,ai,net,in,co.uk,de')
+    DOMAIN_CANDIDATE_MAX: int = int(os.environ.get('DOMAIN_CANDIDATE_MAX', '16'))
+    DOMAIN_PROBE_TIMEOUT: float = float(os.environ.get('DOMAIN_PROBE_TIMEOUT', '4'))
+    # Once a candidate answers, how long higher-ranked probes still get
+    DOMAIN_PROBE_GRACE_SECONDS: float = float(os.environ.get('DOMAIN_PROBE_GRACE_SECONDS', '1'))
+    
+    # HTML parsing
+    HTML_PARSER_BACKEND: str = os.environ.get('HTML_PARSER_BACKEND', 'lxml')  # or 'html.parser'
+    HTML_PARSE_EXECUTOR: str = os.environ.get('HTML_PARSE_EXECUTOR', 'thread')  # or 'process'
+    HTML_PARSE_WORKERS: int = int(os.environ.get('HTML_PARSE_WORKERS', '4'))
+    HTML_PARSE_CACHE_SIZE: int = int(os.environ.get('HTML_PARSE_CACHE_SIZE', '512'))
+    
+    # Crawl latency budgets (end to end, including AI enrichment)
+    CRAWL_DEADLINE_SECONDS: float = float(os.environ.get('CRAWL_DEADLINE_SECONDS', '20'))
+    CRAWL_BULK_DEADLINE_SECONDS: float = float(os.environ.get('CRAWL_BULK_DEADLINE_SECONDS', '60'))
+    CRAWLER_TIMEOUT_SECONDS: float = float(os.environ.get('CRAWLER_TIMEOUT_SECONDS', '10'))
+    
+    # Per-source circuit breakers
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(os.environ.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+    CIRCUIT_BREAKER_RESET_SECONDS: float = float(os.environ.get('CIRCUIT_BREAKER_RESET_SECONDS', '60'))
+    CIRCUIT_BREAKER_WINDOW: int = int(os.environ.get('CIRCUIT_BREAKER_WINDOW', '50'))
+    
+    # Crawl job queue
+    CRAWL_WORKER_CONCURRENCY: int = int(os.environ.get('CRAWL_WORKER_CONCURRENCY', '10'))
+    CRAWL_QUEUE_POLL_INTERVAL: float = float(os.environ.get('CRAWL_QUEUE_POLL_INTERVAL', '2'))
+    CRAWL_JOB_LEASE_SECONDS: int = int(os.environ.get('CRAWL_JOB_LEASE_SECONDS', '300'))
+    CRAWL_JOB_MAX_ATTEMPTS: int = int(os.environ.get('CRAWL_JOB_MAX_ATTEMPTS', '3'))
+    CRAWL_QUEUE_SWEEP_INTERVAL: float = float(os.environ.get('CRAWL_QUEUE_SWEEP_INTERVAL', '60'))
+    # Finished queue jobs are dropped by a TTL index this long after completion
+    CRAWL_JOB_RETENTION_DAYS: float = float(os.environ.get('CRAWL_JOB_RETENTION_DAYS', '7'))
+    
+    # Central ledger cache (0 disables cache-first resolution)
+    LEDGER_CACHE_TTL_HOURS: float = float(os.environ.get('LEDGER_CACHE_TTL_HOURS', '168'))
+    
+    # Bulk uploads
+    BULK_UPLOAD_BATCH_SIZE: int = int(os.environ.get('BULK_UPLOAD_BATCH_SIZE', '1000'))
+    
     class Config:
         env_file = ".env"
 
@@ -1,9 +1,20 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from core.config import get_settings
+from datetime import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+def create_client() -> AsyncIOMotorClient:
+    """
+    MongoDB client with the app's codec settings
+    
+    Timestamps are stored as native BSON datetimes and decoded as
+    timezone-aware UTC datetimes, so models round-trip without conversion.
+    """
+    settings = get_settings()
+    return AsyncIOMotorClient(settings.MONGO_URL, tz_aware=True, tzinfo=timezone.utc)
+
 class Database:
     client: AsyncIOMotorClient = None
     db: AsyncIOMotorDatabase = None
@@ -12,7 +23,7 @@ class Database:
     def connect(cls):
         """Connect to MongoDB"""
         settings = get_settings()
-        cls.client = AsyncIOMotorClient(settings.MONGO_URL)
+        cls.client = create_client()
         cls.db = cls.client[settings.DB_NAME]
         logger.info(f"Connected to MongoDB: {settings.DB_NAME}")
 
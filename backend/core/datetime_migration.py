@@ -0,0 +1,192 @@
+"""
+Convert timestamps stored as ISO strings to native BSON datetimes
+
+Safe to run against a live database and to interrupt and re-run:
+
+    python -m core.datetime_migration [--batch-size 500] [--pause 0.05] [--dry-run]
+
+Documents are walked in _id order in small batches. Each update only applies
+if the field still holds the string that was read, so concurrent writes are
+never overwritten. Fields inside arrays are written as `array[].field`; the
+array is rewritten as a whole, and only if it is unchanged since it was read.
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FIELDS = {
+    "users": ["created_at"],
+    "crawl_requests": ["created_at", "completed_at", "result.last_crawled", "result.latest_news[].date"],
+    "crawl_jobs": ["created_at", "completed_at", "lease_expires_at"],
+    "bulk_jobs": ["created_at", "completed_at"],
+    "central_ledger": ["last_crawled", "latest_news[].date"],
+    "blogs": ["created_at", "updated_at"],
+    "faqs": ["created_at", "updated_at"],
+    "plans": ["created_at"],
+    "transactions": ["created_at", "completed_at"],
+}
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse a stored ISO timestamp, treating naive values as UTC"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    for part in path.split('.'):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    return doc
+
+def _string_filter(fields: List[str]) -> Dict[str, Any]:
+    # {"$type": "string"} on a path through an array matches any element
+    return {"$or": [{field.replace('[]', ''): {"$type": "string"}} for field in fields]}
+
+def _stored_path(field: str) -> str:
+    """The path that is read and written: the array itself for `array[].field`"""
+    return field.split('[]')[0]
+
+def _convert_array(items: Any, key: str) -> Tuple[Optional[List[Any]], int]:
+    """
+    Parse the string `key` of each element of an array
+
+    Returns:
+        (converted array, or None if nothing changed; values that did not parse)
+    """
+    if not isinstance(items, list):
+        return None, 0
+
+    converted, changed, unparsable = [], False, 0
+    for item in items:
+        value = item.get(key) if isinstance(item, dict) else None
+        if isinstance(value, str):
+            parsed = parse_timestamp(value)
+            if parsed is None:
+                unparsable += 1
+            else:
+                item = {**item, key: parsed}
+                changed = True
+        converted.append(item)
+    return (converted if changed else None), unparsable
+
+async def migrate_collection(
+    db: AsyncIOMotorDatabase,
+    collection: str,
+    fields: List[str],
+    batch_size: int = 500,
+    pause: float = 0.05
+) -> Tuple[int, int]:
+    """
+    Convert string timestamps in one collection
+
+    Returns:
+        (documents updated, values left as-is because they did not parse)
+    """
+    migrated = 0
+    unparsable = 0
+    last_id = None
+
+    while True:
+        query = _string_filter(fields)
+        if last_id is not None:
+            query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+
+        docs = await db[collection].find(
+            query, {_stored_path(field): 1 for field in fields}
+        ).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not docs:
+            break
+
+        operations = []
+        for doc in docs:
+            expected, updates = {}, {}
+            for field in fields:
+                if '[]' in field:
+                    path = _stored_path(field)
+                    items = _get_path(doc, path)
+                    converted, bad = _convert_array(items, field.split('[].', 1)[1])
+                    if bad:
+                        unparsable += bad
+                        logger.warning(f"{collection} {doc['_id']}: cannot parse {bad} {field} value(s)")
+                    if converted is not None:
+                        expected[path] = items
+                        updates[path] = converted
+                    continue
+                
+                value = _get_path(doc, field)
+                if not isinstance(value, str):
+                    continue
+                parsed = parse_timestamp(value)
+                if parsed is None:
+                    unparsable += 1
+                    logger.warning(f"{collection} {doc['_id']}: cannot parse {field}={value!r}")
+                    continue
+                expected[field] = value
+                updates[field] = parsed
+            if updates:
+                operations.append(UpdateOne({"_id": doc["_id"], **expected}, {"$set": updates}))
+
+        if operations:
+            result = await db[collection].bulk_write(operations, ordered=False)
+            migrated += result.modified_count
+
+        last_id = docs[-1]["_id"]
+        # Yield to live traffic between batches
+        await asyncio.sleep(pause)
+
+    return migrated, unparsable
+
+async def migrate_datetimes(db: AsyncIOMotorDatabase, batch_size: int = 500, pause: float = 0.05) -> Dict[str, int]:
+    """
+    Convert string timestamps in every collection
+
+    Returns:
+        Documents updated per collection
+    """
+    report = {}
+    for collection, fields in DATETIME_FIELDS.items():
+        migrated, unparsable = await migrate_collection(db, collection, fields, batch_size, pause)
+        report[collection] = migrated
+        logger.info(f"Migrated {migrated} {collection} documents ({unparsable} unparsable values)")
+    return report
+
+async def count_pending(db: AsyncIOMotorDatabase) -> Dict[str, int]:
+    """Documents per collection that still hold string timestamps"""
+    return {
+        collection: await db[collection].count_documents(_string_filter(fields))
+        for collection, fields in DATETIME_FIELDS.items()
+    }
+
+async def _main(args: argparse.Namespace) -> int:
+    from core.database import db_instance
+
+    db = db_instance.get_db()
+    try:
+        if args.dry_run:
+            for collection, pending in (await count_pending(db)).items():
+                print(f"{collection}: {pending} document(s) to migrate")
+            return 0
+
+        for collection, migrated in (await migrate_datetimes(db, args.batch_size, args.pause)).items():
+            print(f"  ✓ {collection}: {migrated} document(s) migrated")
+        return 0
+    finally:
+        db_instance.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert ISO string timestamps to BSON datetimes")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.05, help="seconds to sleep between batches")
+    parser.add_argument('--dry-run', action='store_true', help="only count documents to migrate")
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main(parser.parse_args())))
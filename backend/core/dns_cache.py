@@ -0,0 +1,80 @@
+from aiohttp.abc import AbstractResolver, ResolveResult
+from aiohttp.resolver import ThreadedResolver
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+import asyncio
+import logging
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+# getaddrinfo errors that mean the name does not exist (as opposed to a
+# transient failure such as EAI_AGAIN, which is never cached)
+NEGATIVE_ERRNOS = {
+    getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, name)
+}
+
+class CachingResolver(AbstractResolver):
+    """
+    Async DNS resolver with positive and negative caching.
+    
+    Wraps aiohttp's ThreadedResolver. Successful lookups are cached for
+    `ttl` seconds and non-existent names (NXDOMAIN/NODATA) for
+    `negative_ttl`, so repeated guesses at domains that do not exist fail
+    immediately. Concurrent lookups of the same name share one query.
+    """
+    
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int):
+        self._resolver = ThreadedResolver()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple, Tuple[float, Union[List[ResolveResult], socket.gaierror]]]" = OrderedDict()
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+    
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> List[ResolveResult]:
+        key = (host.lower(), port, family)
+        
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            result = cached[1]
+            if isinstance(result, socket.gaierror):
+                self.stats["negative_hits"] += 1
+                raise socket.gaierror(*result.args)
+            self.stats["hits"] += 1
+            return result
+        
+        self.stats["misses"] += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._lookup(key, host, port, family))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+    
+    async def _lookup(self, key: Tuple, host: str, port: int, family: socket.AddressFamily) -> List[ResolveResult]:
+        try:
+            result = await self._resolver.resolve(host, port, family)
+        except socket.gaierror as e:
+            if e.errno in NEGATIVE_ERRNOS:
+                self._store(key, e, self.negative_ttl)
+            raise
+        
+        self._store(key, result, self.ttl)
+        return result
+    
+    def _store(self, key: Tuple, value, ttl: float):
+        if ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+    
+    async def close(self) -> None:
+        await self._resolver.close()
@@ -0,0 +1,112 @@
+import aiohttp
+from core.config import get_settings
+from core.dns_cache import CachingResolver
+from typing import Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+CHARSET_SNIFF_BYTES = 4096
+
+class HTTPClient:
+    """Application-wide pooled HTTP client shared by all crawlers"""
+    session: aiohttp.ClientSession = None
+    resolver: CachingResolver = None
+
+    @classmethod
+    def connect(cls):
+        """Create the shared session with a pooled, keep-alive connector"""
+        settings = get_settings()
+        # DNS caching (including negative answers) is done by our resolver
+        cls.resolver = CachingResolver(
+            ttl=settings.HTTP_DNS_CACHE_TTL,
+            negative_ttl=settings.HTTP_DNS_NEGATIVE_TTL,
+            max_entries=settings.HTTP_DNS_CACHE_MAX_ENTRIES
+        )
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_MAX_CONNECTIONS,
+            limit_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            resolver=cls.resolver,
+            use_dns_cache=False
+        )
+        cls.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT_SECONDS)
+        )
+        logger.info(
+            f"Created HTTP client pool (limit={settings.HTTP_MAX_CONNECTIONS}, "
+            f"per_host={settings.HTTP_MAX_CONNECTIONS_PER_HOST})"
+        )
+
+    @classmethod
+    async def close(cls):
+        """Close the shared session and its connection pool"""
+        if cls.session and not cls.session.closed:
+            await cls.session.close()
+            logger.info("Closed HTTP client pool")
+        if cls.resolver:
+            await cls.resolver.close()
+        cls.session = None
+        cls.resolver = None
+
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use"""
+        if cls.session is None or cls.session.closed:
+            cls.connect()
+        return cls.session
+
+http_client = HTTPClient()
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Dependency for getting the shared HTTP session"""
+    return http_client.get_session()
+
+async def read_capped(
+    response: aiohttp.ClientResponse,
+    max_bytes: int,
+    stop_after: Optional[bytes] = None
+) -> bytes:
+    """
+    Stream a response body up to max_bytes, stopping early once stop_after
+    (matched case-insensitively, e.g. b'</head>') has been received
+    
+    Whatever is left unread is discarded with the connection.
+    """
+    settings = get_settings()
+    marker = stop_after.lower() if stop_after else None
+    body = bytearray()
+    
+    async for chunk in response.content.iter_chunked(settings.HTTP_READ_CHUNK_SIZE):
+        search_from = max(0, len(body) - len(marker) + 1) if marker else 0
+        body += chunk
+        
+        if marker:
+            index = bytes(body[search_from:]).lower().find(marker)
+            if index != -1:
+                del body[search_from + index + len(marker):]
+                break
+        
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            break
+    
+    return bytes(body)
+
+def decode_body(body: bytes, charset: Optional[str] = None) -> str:
+    """
+    Decode an HTML body using the declared charset, a <meta charset> in the
+    first few KB, or UTF-8, without running charset detection over the body
+    """
+    if not charset:
+        match = META_CHARSET.search(body[:CHARSET_SNIFF_BYTES])
+        if match:
+            charset = match.group(1).decode('ascii')
+    
+    try:
+        return body.decode(charset or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
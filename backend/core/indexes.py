@@ -0,0 +1,178 @@
+"""
+Index declarations for every collection, applied on startup
+
+Verify a deployment against them with:
+
+    python -m core.indexes verify
+
+which reports declared indexes that are missing, indexes that exist but are
+not declared, and indexes with no recorded use since the server started.
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from core.config import get_settings
+from typing import Dict, List
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+INDEX_OPTIONS_CONFLICT = 85
+INDEX_KEY_SPECS_CONFLICT = 86
+
+def declared_indexes() -> Dict[str, List[IndexModel]]:
+    """Indexes per collection, named so they can be compared with the server"""
+    settings = get_settings()
+    return {
+        "users": [
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        ],
+        "crawl_requests": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_history"),
+        ],
+        "crawl_jobs": [
+            IndexModel(
+                [("status", ASCENDING), ("priority", ASCENDING), ("created_at", ASCENDING)], name="claim_order"
+            ),
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+            # Only finished jobs have completed_at, so queued ones never expire
+            IndexModel(
+                [("completed_at", ASCENDING)], name="completed_at_ttl",
+                expireAfterSeconds=int(settings.CRAWL_JOB_RETENTION_DAYS * 86400)
+            ),
+        ],
+        "bulk_jobs": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        ],
+        "central_ledger": [
+            # Records written before the ledger was keyed on a string
+            # identifier may have domain: null, so only strings must be unique
+            IndexModel(
+                [("domain", ASCENDING)], name="domain_unique", unique=True,
+                partialFilterExpression={"domain": {"$type": "string"}}
+            ),
+            IndexModel([("lookup_keys", ASCENDING), ("last_crawled", DESCENDING)], name="fresh_lookup"),
+        ],
+        "blogs": [
+            IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True),
+            IndexModel([("is_published", ASCENDING), ("created_at", DESCENDING)], name="published_listing"),
+        ],
+        "faqs": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+            IndexModel([("is_published", ASCENDING), ("order", ASCENDING)], name="published_listing"),
+        ],
+        "plans": [
+            IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+        ],
+        "transactions": [
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        ],
+        "http_cache": [
+            IndexModel([("url", ASCENDING)], name="url_unique", unique=True),
+            IndexModel(
+                [("stored_at", ASCENDING)], name="stored_at_ttl",
+                expireAfterSeconds=int(settings.HTTP_CACHE_TTL_DAYS * 86400)
+            ),
+        ],
+        "llm_cache": [
+            IndexModel([("key", ASCENDING)], name="key_unique", unique=True),
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ],
+    }
+
+async def ensure_indexes(db: AsyncIOMotorDatabase):
+    """
+    Create any declared index that does not exist yet
+
+    Existing indexes are left alone, except that a changed TTL is applied in
+    place and an index whose keys or other options changed is rebuilt.
+    Failures (e.g. duplicates blocking a unique index) are logged rather
+    than stopping startup.
+    """
+    for collection, indexes in declared_indexes().items():
+        for index in indexes:
+            spec = index.document
+            try:
+                await db[collection].create_indexes([index])
+            except OperationFailure as e:
+                if e.code == INDEX_OPTIONS_CONFLICT and 'expireAfterSeconds' in spec:
+                    await db.command(
+                        "collMod", collection,
+                        index={"name": spec["name"], "expireAfterSeconds": spec["expireAfterSeconds"]}
+                    )
+                    logger.info(f"Updated TTL of {collection}.{spec['name']}")
+                elif e.code in (INDEX_OPTIONS_CONFLICT, INDEX_KEY_SPECS_CONFLICT):
+                    try:
+                        await db[collection].drop_index(spec["name"])
+                        await db[collection].create_indexes([index])
+                        logger.info(f"Rebuilt {collection}.{spec['name']} with new keys or options")
+                    except OperationFailure as rebuild_error:
+                        logger.error(f"Could not rebuild index {collection}.{spec['name']}: {str(rebuild_error)}")
+                else:
+                    logger.error(f"Could not create index {collection}.{spec['name']}: {str(e)}")
+    logger.info("Database indexes ensured")
+
+async def verify_indexes(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Compare the server's indexes with the declared ones
+
+    Returns:
+        Per collection: missing, undeclared and unused index names
+    """
+    report = {}
+    for collection, indexes in declared_indexes().items():
+        declared = {index.document["name"]: dict(index.document["key"]) for index in indexes}
+        existing = {}
+        async for index in db[collection].list_indexes():
+            existing[index["name"]] = dict(index["key"])
+
+        unused = []
+        try:
+            async for stat in db[collection].aggregate([{"$indexStats": {}}]):
+                if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0:
+                    unused.append(stat["name"])
+        except OperationFailure as e:
+            logger.warning(f"Index usage unavailable for {collection}: {str(e)}")
+
+        report[collection] = {
+            "missing": [
+                name for name, key in declared.items() if existing.get(name) != key
+            ],
+            "undeclared": [
+                name for name in existing if name != "_id_" and name not in declared
+            ],
+            "unused": sorted(unused)
+        }
+    return report
+
+async def _main(command: str) -> int:
+    from core.database import db_instance
+
+    db = db_instance.get_db()
+    try:
+        if command == "ensure":
+            await ensure_indexes(db)
+            return 0
+
+        report = await verify_indexes(db)
+        problems = 0
+        for collection, result in report.items():
+            for kind in ("missing", "undeclared", "unused"):
+                for name in result[kind]:
+                    print(f"{collection}.{name}: {kind}")
+            problems += len(result["missing"])
+        print("✓ All declared indexes present" if not problems else f"✗ {problems} missing index(es)")
+        return 1 if problems else 0
+    finally:
+        db_instance.close()
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command not in ("ensure", "verify"):
+        print("usage: python -m core.indexes [ensure|verify]")
+        sys.exit(2)
+    sys.exit(asyncio.run(_main(command)))
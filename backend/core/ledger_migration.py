@@ -0,0 +1,92 @@
+"""
+Backfill lookup_keys on central_ledger records written before they existed
+
+Safe to run against a live database and to interrupt and re-run:
+
+    python -m core.ledger_migration [--batch-size 500] [--pause 0.05] [--dry-run]
+
+Records are keyed under their domain and LinkedIn URL, the identifiers
+CrawlService indexes new records under. The query a legacy record was
+crawled for was never stored, so company-name lookups only hit it once it is
+crawled again. Each update only applies if the record still has no
+lookup_keys, so records rewritten by a crawl meanwhile are left alone.
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from services.input_normalizer import normalize_input_value, input_key
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+MISSING_KEYS = {"lookup_keys": {"$exists": False}}
+
+def record_lookup_keys(record: Dict[str, Any]) -> List[str]:
+    """Keys a legacy record can be found under"""
+    keys = []
+    for input_type in ('domain', 'linkedin_url'):
+        value = normalize_input_value(input_type, record.get(input_type))
+        if value:
+            keys.append(input_key(input_type, value))
+    return list(dict.fromkeys(keys))
+
+async def backfill_lookup_keys(db: AsyncIOMotorDatabase, batch_size: int = 500, pause: float = 0.05) -> int:
+    """
+    Add lookup_keys to every ledger record without them
+
+    Returns:
+        Records updated
+    """
+    migrated = 0
+    last_id = None
+
+    while True:
+        query = MISSING_KEYS if last_id is None else {"$and": [MISSING_KEYS, {"_id": {"$gt": last_id}}]}
+        docs = await db.central_ledger.find(
+            query, {"domain": 1, "linkedin_url": 1}
+        ).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not docs:
+            break
+
+        # Records with no usable identifier get an empty list so they are
+        # not visited again
+        operations = [
+            UpdateOne({"_id": doc["_id"], **MISSING_KEYS}, {"$set": {"lookup_keys": record_lookup_keys(doc)}})
+            for doc in docs
+        ]
+        result = await db.central_ledger.bulk_write(operations, ordered=False)
+        migrated += result.modified_count
+
+        last_id = docs[-1]["_id"]
+        # Yield to live traffic between batches
+        await asyncio.sleep(pause)
+
+    logger.info(f"Backfilled lookup_keys on {migrated} ledger records")
+    return migrated
+
+async def _main(args: argparse.Namespace) -> int:
+    from core.database import db_instance
+
+    db = db_instance.get_db()
+    try:
+        if args.dry_run:
+            pending = await db.central_ledger.count_documents(MISSING_KEYS)
+            print(f"central_ledger: {pending} record(s) to backfill")
+            return 0
+
+        migrated = await backfill_lookup_keys(db, args.batch_size, args.pause)
+        print(f"  ✓ central_ledger: {migrated} record(s) backfilled")
+        return 0
+    finally:
+        db_instance.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill lookup_keys on central ledger records")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.05, help="seconds to sleep between batches")
+    parser.add_argument('--dry-run', action='store_true', help="only count records to backfill")
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main(parser.parse_args())))
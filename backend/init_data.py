@@ -4,8 +4,8 @@ Run this script once to populate initial content
 """
 import asyncio
 import sys
-from motor.motor_asyncio import AsyncIOMotorClient
 from core.config import get_settings
+from core.database import create_client
 from models.content import Blog, FAQ
 from datetime import datetime, timezone
 
@@ -661,7 +661,7 @@ INITIAL_FAQS = [
 
 async def init_content():
     """Initialize blogs and FAQs"""
-    client = AsyncIOMotorClient(settings.MONGO_URL)
+    client = create_client()
     db = client[settings.DB_NAME]
     
     print("Initializing blog posts...")
@@ -673,10 +673,7 @@ async def init_content():
                 author="CorpInfo Team",
                 is_published=True
             )
-            blog_dict = blog.model_dump()
-            blog_dict['created_at'] = blog_dict['created_at'].isoformat()
-            blog_dict['updated_at'] = blog_dict['updated_at'].isoformat()
-            await db.blogs.insert_one(blog_dict)
+            await db.blogs.insert_one(blog.model_dump())
             print(f"  ✓ Created blog: {blog_data['title']}")
         else:
             print(f"  - Blog already exists: {blog_data['title']}")
@@ -684,10 +681,7 @@ async def init_content():
     print("\nInitializing FAQs...")
     for faq_data in INITIAL_FAQS:
         faq = FAQ(**faq_data, is_published=True)
-        faq_dict = faq.model_dump()
-        faq_dict['created_at'] = faq_dict['created_at'].isoformat()
-        faq_dict['updated_at'] = faq_dict['updated_at'].isoformat()
-        await db.faqs.insert_one(faq_dict)
+        await db.faqs.insert_one(faq.model_dump())
         print(f"  ✓ Created FAQ: {faq_data['question'][:50]}...")
     
     print("\n✓ Content initialization complete!")
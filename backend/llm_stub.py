@@ -0,0 +1,138 @@
+"""
+Local stand-in for the Groq/OpenAI chat completions API
+Point AIService at it with GROQ_BASE_URL=http://127.0.0.1:8090 to benchmark
+or load-test enrichment without network access or API spend
+
+    python llm_stub.py --latency lognormal --latency-mean 1.2 --error-rate 0.02
+
+GET /stats reports request, error and peak concurrency counts.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from aiohttp import web
+
+DEFAULT_ANSWERS = {
+    "enrich": {
+        "company_name": "Stub Company",
+        "industry": "Software",
+        "employee_size": "50-200",
+        "description": "A company answered by the local LLM stub.",
+        "founded_on": "2010"
+    },
+    "validate_linkedin": "0.7"
+}
+
+class LLMStub:
+    """Chat completions endpoint with configurable latency, errors and answers"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.answers = dict(DEFAULT_ANSWERS)
+        if args.answers:
+            with open(args.answers) as f:
+                self.answers.update(json.load(f))
+        self.random = random.Random(args.seed)
+        self.stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def latency(self) -> float:
+        mean, spread = self.args.latency_mean, self.args.latency_spread
+        if self.args.latency == 'uniform':
+            value = self.random.uniform(mean - spread, mean + spread)
+        elif self.args.latency == 'normal':
+            value = self.random.gauss(mean, spread)
+        elif self.args.latency == 'lognormal':
+            value = mean * self.random.lognormvariate(0, spread)
+        else:
+            value = mean
+        return max(value, 0.0)
+
+    def answer(self, prompt: str) -> str:
+        """Canned answer shaped like the request (batch, single or score)"""
+        if 'LinkedIn URL' in prompt:
+            return str(self.answers["validate_linkedin"])
+
+        enrich = self.answers["enrich"]
+        if '"companies"' in prompt:
+            # Answer each company in the batch, with the fields it is missing
+            match = re.search(r'^\[.*\]$', prompt, re.MULTILINE)
+            companies = json.loads(match.group(0)) if match else []
+            return json.dumps({"companies": [
+                {"id": c["id"], **{f: enrich[f] for f in c.get("missing", []) if f in enrich}}
+                for c in companies
+            ]})
+
+        match = re.search(r'missing fields: (\{.*\})', prompt)
+        fields = json.loads(match.group(1)) if match else enrich
+        return json.dumps({f: enrich[f] for f in fields if f in enrich})
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.stats["requests"] += 1
+        self.stats["in_flight"] += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+        try:
+            await asyncio.sleep(self.latency())
+
+            if self.random.random() < self.args.error_rate:
+                self.stats["errors"] += 1
+                status = self.random.choice(self.args.error_status)
+                return web.json_response(
+                    {"error": {"message": "stub error", "type": "stub_error"}}, status=status
+                )
+
+            prompt = "\n".join(m.get("content") or "" for m in payload.get("messages", []))
+            content = self.answer(prompt)
+            prompt_tokens = len(prompt) // 4
+            completion_tokens = len(content) // 4
+            return web.json_response({
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+        finally:
+            self.stats["in_flight"] -= 1
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        # Groq clients call /openai/v1/..., OpenAI clients /v1/...
+        app.router.add_post('/openai/v1/chat/completions', self.chat_completions)
+        app.router.add_post('/v1/chat/completions', self.chat_completions)
+        app.router.add_get('/stats', self.get_stats)
+        return app
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local Groq/OpenAI-compatible LLM stub")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'normal', 'lognormal'], default='fixed')
+    parser.add_argument('--latency-mean', type=float, default=0.5, help="seconds")
+    parser.add_argument('--latency-spread', type=float, default=0.2,
+                        help="half-width (uniform), std dev (normal) or sigma (lognormal)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument('--error-status', type=lambda v: [int(s) for s in v.split(',')], default=[500, 429])
+    parser.add_argument('--answers', help="JSON file overriding the canned answers")
+    parser.add_argument('--seed', type=int)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    web.run_app(LLMStub(args).app(), host=args.host, port=args.port)
@@ -52,11 +52,32 @@ class CrawlRequest(BaseModel):
     # Input
     input_type: str  # 'company_name', 'domain', 'linkedin_url'
     input_value: str
+    bulk_job_id: Optional[str] = None
+    credit_reserved: bool = False
+    force_refresh: bool = False
     
     # Status
     status: str = "pending"  # pending, processing, completed, failed
     result: Optional[CompanyData] = None
     error: Optional[str] = None
+    cache_hit: bool = False  # result served from the central ledger
+    
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    completed_at: Optional[datetime] = None
+
+class CrawlJob(BaseModel):
+    """Queued unit of crawl work, stored in crawl_jobs"""
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    request_id: str
+    user_id: str
+    
+    status: str = "queued"  # queued, running, completed, failed
+    priority: int = 0  # lower runs first; see services.crawl_queue
+    attempts: int = 0
+    lease_expires_at: Optional[datetime] = None
+    error: Optional[str] = None
     
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     completed_at: Optional[datetime] = None
@@ -71,8 +92,11 @@ class BulkCrawlJob(BaseModel):
     total_requests: int
     completed_requests: int = 0
     failed_requests: int = 0
+    skipped_requests: int = 0  # dropped for lack of credits
+    reserved_credits: int = 0
     
     status: str = "pending"  # pending, processing, completed, failed
+    error: Optional[str] = None  # why reading the upload stopped early
     
     # File tracking
     input_filename: str
@@ -84,6 +108,7 @@ class BulkCrawlJob(BaseModel):
 class CrawlRequestCreate(BaseModel):
     input_type: str
     input_value: str
+    force_refresh: bool = False  # bypass the central ledger cache
 
 class BulkCrawlRequest(BaseModel):
     requests: List[CrawlRequestCreate]
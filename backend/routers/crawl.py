@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from models.company import CrawlRequestCreate, CrawlRequest, CompanyData
+from models.company import CrawlRequestCreate, CrawlRequest, CompanyData, BulkCrawlJob
 from services.crawl_service import CrawlService
+from services.bulk_upload_reader import is_supported_upload, read_upload_values
+from services.circuit_breaker import circuit_breakers
+from services.llm_cache import llm_cache
+from services.ai_service import AIService
+from core.config import get_settings
 from core.database import get_db
-from core.auth import get_current_user
+from core.auth import get_current_user, get_current_superadmin
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List
-import pandas as pd
-import io
 
 router = APIRouter(prefix="/crawl", tags=["Crawl"])
 
@@ -60,36 +63,66 @@ async def search_companies(
 async def bulk_upload(
     file: UploadFile = File(...),
     input_type: str = "domain",
+    force_refresh: bool = False,
     current_user: dict = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Upload CSV/Excel file for bulk crawling"""
+    if not file.filename or not is_supported_upload(file.filename):
+        raise HTTPException(status_code=400, detail="Invalid file format. Use CSV or Excel")
+    
     try:
-        contents = await file.read()
-        
-        # Read file based on type
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(contents))
-        elif file.filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(io.BytesIO(contents))
-        else:
-            raise HTTPException(status_code=400, detail="Invalid file format. Use CSV or Excel")
-        
-        # Process rows
+        settings = get_settings()
         crawl_service = CrawlService(db)
-        requests = []
         
-        for _, row in df.iterrows():
-            # Assume first column contains the input values
-            input_value = str(row.iloc[0])
-            request_data = CrawlRequestCreate(input_type=input_type, input_value=input_value)
-            req = await crawl_service.create_crawl_request(current_user['sub'], request_data)
-            requests.append(req.id)
+        # Assume first column contains the input values
+        bulk_job = await crawl_service.create_bulk_crawl_job(
+            user_id=current_user['sub'],
+            input_type=input_type,
+            filename=file.filename,
+            value_batches=read_upload_values(file, settings.BULK_UPLOAD_BATCH_SIZE),
+            force_refresh=force_refresh
+        )
+        
+        message = f"Created {bulk_job.total_requests} crawl requests"
+        if bulk_job.skipped_requests:
+            message += f" ({bulk_job.skipped_requests} skipped: insufficient credits)"
+        if bulk_job.error:
+            message += f"; stopped reading the file early: {bulk_job.error}"
         
         return {
-            "message": f"Created {len(requests)} crawl requests",
-            "request_ids": requests
+            "message": message,
+            "job_id": bulk_job.id,
+            "total_requests": bulk_job.total_requests,
+            "skipped_requests": bulk_job.skipped_requests,
+            "error": bulk_job.error
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/bulk/{job_id}", response_model=BulkCrawlJob)
+async def get_bulk_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Get bulk crawl job progress"""
+    crawl_service = CrawlService(db)
+    bulk_job = await crawl_service.get_bulk_job(job_id, current_user['sub'])
+    
+    if not bulk_job:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    
+    return bulk_job
+
+@router.get("/metrics")
+async def get_crawl_metrics(current_user: dict = Depends(get_current_superadmin)):
+    """Crawler health: circuit breaker state per source, LLM cache hits and token usage"""
+    return {
+        "circuit_breakers": circuit_breakers.snapshot(),
+        "llm_cache": llm_cache.stats,
+        "llm_usage": AIService.usage
+    }
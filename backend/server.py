@@ -3,10 +3,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse, FileResponse
 from core.config import get_settings
 from core.database import db_instance
+from core.http_client import http_client
+from core.indexes import ensure_indexes
 from routers import auth, crawl, payment, content
 import logging
 from contextlib import asynccontextmanager
 from services.payment_service import PaymentService
+from services.crawl_queue import crawl_queue
+from services.html_parser import html_parser_pool
+from services.ai_service import AIService
 
 # Configure logging
 logging.basicConfig(
@@ -23,17 +28,35 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting CorpInfo API...")
     db_instance.connect()
+    if settings.MONGO_ENSURE_INDEXES:
+        await ensure_indexes(db_instance.get_db())
+    http_client.connect()
+    html_parser_pool.start()
     
     # Initialize plans
     payment_service = PaymentService(db_instance.get_db())
     await payment_service.initialize_plans()
     
+    # Start crawl workers
+    await crawl_queue.start(db_instance.get_db())
+    
+    exempt = {name.strip() for name in settings.ROBOTS_EXEMPT_SOURCES.split(',')}
+    if settings.ROBOTS_RESPECT and 'LinkedInCrawler' not in exempt:
+        logger.warning(
+            "LinkedInCrawler is effectively disabled: linkedin.com's robots.txt disallows generic crawlers. "
+            "Add it to ROBOTS_EXEMPT_SOURCES to enable it."
+        )
+    
     logger.info("CorpInfo API started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down CorpInfo API...")
+    await crawl_queue.stop()
+    await http_client.close()
+    await AIService.close()
+    html_parser_pool.close()
     db_instance.close()
 
 app = FastAPI(
@@ -1,22 +1,136 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 import logging
-from groq import Groq
+from groq import AsyncGroq
 from core.config import get_settings
+from services.llm_cache import llm_cache
+from services.name_matcher import score_linkedin_match, is_confident
+import asyncio
 import json
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+ENRICHMENT_SYSTEM_PROMPT = "You are a business intelligence assistant specialized in company data enrichment. Provide accurate, structured information about companies. Always respond in valid JSON format."
+
+# Fields the LLM may fill, with the format asked for each
+ENRICHMENT_FIELDS = {
+    "company_name": "official company name",
+    "industry": "primary industry",
+    "employee_size": "size range (e.g., 50-200, 1000+)",
+    "description": "brief company description",
+    "founded_on": "year if known"
+}
+
+# Crawled fields sent to the LLM as context; news, links and contact
+# lists do not help with the fields above and are left out
+CONTEXT_FIELDS = ('company_name', 'domain', 'linkedin_url', 'industry', 'description', 'country', 'location')
+CONTEXT_MAX_CHARS = 300
+
 class AIService:
     """AI service for enriching and validating company data using Groq"""
     
+    # One async client (and connection pool) and one concurrency limit for
+    # the whole process, shared by every AIService instance
+    _client: Optional[AsyncGroq] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    
+    # Pending batched enrichments: (data, query, query_type, future)
+    _batch: List[Tuple[Dict[str, Any], str, str, asyncio.Future]] = []
+    _batch_timer: Optional[asyncio.TimerHandle] = None
+    _batch_tasks: Set[asyncio.Task] = set()
+    
+    # Token usage per kind of call, for measuring prompt cost
+    usage: Dict[str, Dict[str, int]] = {}
+    
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY) if settings.GROQ_API_KEY else None
+        self.client = self._get_client()
         self.model = "llama-3.3-70b-versatile"  # Fast and accurate model
     
+    @classmethod
+    def _get_client(cls) -> Optional[AsyncGroq]:
+        if cls._client is None and (settings.GROQ_API_KEY or settings.GROQ_BASE_URL):
+            cls._client = AsyncGroq(
+                api_key=settings.GROQ_API_KEY or "local",
+                base_url=settings.GROQ_BASE_URL or None,
+                timeout=settings.AI_TIMEOUT_SECONDS,
+                max_retries=0
+            )
+        return cls._client
+    
+    @classmethod
+    async def close(cls):
+        """Close the shared Groq client"""
+        if cls._client is not None:
+            await cls._client.close()
+            cls._client = None
+    
+    async def _chat(
+        self,
+        purpose: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: Optional[float] = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Run a chat completion without blocking the event loop
+        
+        Completions are served from the LLM response cache when the same
+        prompt was sent to the same model before. At most
+        AI_MAX_CONCURRENCY calls are in flight; the wait for a slot counts
+        towards the time limit of each call (default AI_TIMEOUT_SECONDS).
+        Token usage is recorded under `purpose`. Only completions that
+        `validate` accepts are cached, so one malformed answer is not
+        replayed for the lifetime of the cache entry.
+        
+        Returns:
+            The completion text
+        """
+        usage = AIService.usage.setdefault(
+            purpose, {"calls": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        )
+        cache_key = llm_cache.key(self.model, messages)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None and (validate is None or validate(cached)):
+            usage["cache_hits"] += 1
+            return cached
+        
+        if AIService._semaphore is None:
+            AIService._semaphore = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+        
+        timeout = timeout or settings.AI_TIMEOUT_SECONDS
+        
+        async def call():
+            async with AIService._semaphore:
+                return await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.1,  # Low temperature for consistency
+                    max_tokens=max_tokens,
+                    timeout=timeout
+                )
+        
+        response = await asyncio.wait_for(call(), timeout=timeout)
+        content = response.choices[0].message.content or ""
+        
+        usage["calls"] += 1
+        if getattr(response, 'usage', None):
+            usage["prompt_tokens"] += response.usage.prompt_tokens or 0
+            usage["completion_tokens"] += response.usage.completion_tokens or 0
+            logger.info(
+                f"LLM {purpose}: {response.usage.prompt_tokens} prompt + "
+                f"{response.usage.completion_tokens} completion tokens"
+            )
+        if validate is None or validate(content):
+            await llm_cache.store(cache_key, self.model, content)
+        return content
+    
     async def enrich_company_data(self, data: Dict[str, Any], query: str, query_type: str) -> Dict[str, Any]:
         """
-        Use AI to enrich and validate company data
+        Use AI to fill in missing company data
+        
+        Only fields of ENRICHMENT_FIELDS that are still empty are asked for;
+        no call is made when all of them are filled.
         
         Args:
             data: Current company data
@@ -30,98 +144,256 @@ class AIService:
             logger.warning("Groq API key not configured")
             return {}
         
+        missing = self._missing_fields(data)
+        if not missing:
+            return {}
+        
         try:
             # Create prompt for AI
-            prompt = self._create_enrichment_prompt(data, query, query_type)
+            prompt = self._create_enrichment_prompt(data, query, query_type, missing)
             
             # Call Groq API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            ai_response = await self._chat(
+                "enrich",
+                [
                     {
                         "role": "system",
-                        "content": "You are a business intelligence assistant specialized in company data enrichment. Provide accurate, structured information about companies. Always respond in valid JSON format."
+                        "content": ENRICHMENT_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                temperature=0.1,  # Low temperature for consistency
-                max_tokens=1000
+                max_tokens=100 + 100 * len(missing),
+                validate=lambda response: isinstance(self._load_json(response), dict)
             )
             
-            # Parse response
-            ai_response = response.choices[0].message.content
-            
             # Extract JSON from response
             enriched_data = self._parse_ai_response(ai_response)
             
-            return enriched_data
+            return {field: value for field, value in enriched_data.items() if field in missing}
         
+        except asyncio.TimeoutError:
+            logger.warning(f"AI enrichment for {query} timed out")
+            return {}
         except Exception as e:
             logger.error(f"Error in AI enrichment: {str(e)}")
             return {}
     
-    def _create_enrichment_prompt(self, data: Dict[str, Any], query: str, query_type: str) -> str:
+    async def enrich_company_data_batched(self, data: Dict[str, Any], query: str, query_type: str) -> Dict[str, Any]:
         """
-        Create prompt for AI enrichment
+        Enrich company data as part of a micro-batch
+        
+        Requests from concurrent crawls are collected for up to
+        AI_BATCH_WINDOW_SECONDS, or until AI_BATCH_SIZE are pending, and sent
+        as one chat completion. Companies the batched answer does not cover
+        are enriched with a call of their own.
+        
+        Returns:
+            Enriched data dictionary, as from enrich_company_data
         """
-        return f"""Given the following partially complete company information, please enrich and validate it:
-
-Query: {query}
-Query Type: {query_type}
+        if not self.client:
+            logger.warning("Groq API key not configured")
+            return {}
+        
+        if not self._missing_fields(data):
+            return {}
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        AIService._batch.append((data, query, query_type, future))
+        
+        if len(AIService._batch) >= settings.AI_BATCH_SIZE:
+            self._flush_batch()
+        elif AIService._batch_timer is None:
+            AIService._batch_timer = loop.call_later(settings.AI_BATCH_WINDOW_SECONDS, self._flush_batch)
+        
+        return await future
+    
+    def _flush_batch(self):
+        """Send the pending batch in the background"""
+        if AIService._batch_timer is not None:
+            AIService._batch_timer.cancel()
+            AIService._batch_timer = None
+        
+        batch, AIService._batch = AIService._batch, []
+        if batch:
+            task = asyncio.create_task(self._enrich_batch(batch))
+            AIService._batch_tasks.add(task)
+            task.add_done_callback(AIService._batch_tasks.discard)
+    
+    async def _enrich_batch(self, batch: List[Tuple[Dict[str, Any], str, str, asyncio.Future]]):
+        """Enrich a batch with one call, falling back to per-company calls"""
+        # Callers that gave up (e.g. their crawl deadline passed) are dropped
+        batch = [item for item in batch if not item[3].done()]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        
+        try:
+            if len(batch) > 1:
+                try:
+                    ai_response = await self._chat(
+                        "enrich_batch",
+                        [
+                            {"role": "system", "content": ENRICHMENT_SYSTEM_PROMPT},
+                            {"role": "user", "content": self._create_batch_enrichment_prompt(batch)}
+                        ],
+                        max_tokens=sum(50 + 100 * len(self._missing_fields(item[0])) for item in batch),
+                        timeout=settings.AI_BATCH_TIMEOUT_SECONDS,
+                        validate=lambda response: isinstance(
+                            (self._load_json(response) or {}).get('companies'), list
+                        )
+                    )
+                    results = self._parse_batch_response(ai_response, batch)
+                except Exception as e:
+                    logger.warning(f"Batched AI enrichment of {len(batch)} companies failed: {str(e)}")
+            
+            # Callers may have given up while the batched call was running
+            missing = [i for i, result in enumerate(results) if result is None and not batch[i][3].done()]
+            if missing:
+                if len(batch) > 1:
+                    logger.info(f"Enriching {len(missing)} of {len(batch)} batched companies individually")
+                fallback = await asyncio.gather(*(
+                    self.enrich_company_data(*batch[i][:3]) for i in missing
+                ))
+                for i, result in zip(missing, fallback):
+                    results[i] = result
+        finally:
+            for (_, _, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result or {})
+    
+    def _missing_fields(self, data: Dict[str, Any]) -> List[str]:
+        """Enrichable fields that the crawlers left empty"""
+        return [field for field in ENRICHMENT_FIELDS if not data.get(field)]
+    
+    def _compact_context(self, data: Dict[str, Any], query: str, query_type: str) -> Dict[str, Any]:
+        """
+        The crawled facts worth sending to the LLM, with long text truncated
+        """
+        context = {query_type: query}
+        for field in CONTEXT_FIELDS:
+            value = data.get(field)
+            if value:
+                context[field] = value[:CONTEXT_MAX_CHARS] if isinstance(value, str) else value
+        return context
+    
+    def _field_spec(self, fields: List[str]) -> str:
+        return json.dumps({field: ENRICHMENT_FIELDS[field] for field in fields}, separators=(',', ':'))
+    
+    def _create_batch_enrichment_prompt(self, batch: List[Tuple[Dict[str, Any], str, str, asyncio.Future]]) -> str:
+        """
+        Create one prompt enriching several companies
+        """
+        companies = [
+            {
+                "id": i,
+                "known": self._compact_context(data, query, query_type),
+                "missing": self._missing_fields(data)
+            }
+            for i, (data, query, query_type, _) in enumerate(batch)
+        ]
+        fields = [field for field in ENRICHMENT_FIELDS if any(field in c["missing"] for c in companies)]
+        return f"""Fill in the missing fields for each of these {len(companies)} companies:
+{json.dumps(companies, separators=(',', ':'))}
 
-Current Data:
-{json.dumps(data, indent=2)}
+Field formats: {self._field_spec(fields)}
 
-Please provide:
-1. Missing company information if you can infer it
-2. Validation of existing data
-3. Industry classification
-4. Approximate employee size if not present
-5. Brief description if missing
+Respond in JSON as {{"companies":[{{"id":0,<missing field>:<value>,...}}]}}, one entry per company. Only include fields you are confident about; use {{"id":<id>}} alone for a company you cannot enrich."""
+    
+    def _parse_batch_response(
+        self,
+        response: str,
+        batch: List[Tuple[Dict[str, Any], str, str, asyncio.Future]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Map a batched AI response back to companies by id
+        
+        Returns:
+            Enriched data per company (limited to the fields it was missing),
+            None where the response had no usable entry
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        parsed = self._parse_ai_response(response)
+        entries = parsed.get('companies') if isinstance(parsed, dict) else None
+        if not isinstance(entries, list):
+            return results
+        
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            company_id = entry.get('id')
+            if isinstance(company_id, int) and 0 <= company_id < len(batch) and results[company_id] is None:
+                missing = self._missing_fields(batch[company_id][0])
+                results[company_id] = {field: value for field, value in entry.items() if field in missing}
+        return results
+    
+    def _create_enrichment_prompt(
+        self,
+        data: Dict[str, Any],
+        query: str,
+        query_type: str,
+        missing: List[str]
+    ) -> str:
+        """
+        Create a prompt asking only for the missing fields
+        """
+        return f"""Known facts about a company: {json.dumps(self._compact_context(data, query, query_type), separators=(',', ':'))}
 
-Respond in JSON format with only the fields you can confidently fill or correct. Use this structure:
-{{
-    "company_name": "validated or enriched name",
-    "industry": "primary industry",
-    "employee_size": "size range (e.g., 50-200, 1000+)",
-    "description": "brief company description",
-    "founded_on": "year if known"
-}}
+Fill in these missing fields: {self._field_spec(missing)}
 
-Only include fields you are confident about. Return empty JSON {{}} if you cannot enrich the data."""
+Respond in JSON with only the fields you are confident about. Return empty JSON {{}} if you cannot enrich the data."""
+    
+    def _load_json(self, response: str) -> Optional[Dict[str, Any]]:
+        """
+        The JSON object embedded in an AI response, or None if there is none
+        or it does not parse
+        """
+        # Try to find JSON in response
+        start = response.find('{')
+        end = response.rfind('}') + 1
+        if start == -1 or end <= start:
+            return None
+        
+        try:
+            parsed = json.loads(response[start:end])
+        except ValueError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
     
     def _parse_ai_response(self, response: str) -> Dict[str, Any]:
         """
         Parse AI response and extract JSON
         """
+        parsed = self._load_json(response)
+        if parsed is None and '{' in response:
+            logger.error("Error parsing AI response: no valid JSON object")
+        return parsed or {}
+    
+    def _parse_score(self, response: str) -> Optional[float]:
+        """A confidence score answer clamped to 0.0-1.0, or None"""
         try:
-            # Try to find JSON in response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-            
-            return {}
-        
-        except Exception as e:
-            logger.error(f"Error parsing AI response: {str(e)}")
-            return {}
+            return min(max(float(response.strip()), 0.0), 1.0)
+        except ValueError:
+            return None
     
     async def validate_linkedin_url(self, url: str, company_name: str) -> float:
         """
         Validate if LinkedIn URL matches company name
         
+        Clear matches and mismatches are scored locally (see
+        services.name_matcher); only uncertain cases are sent to the LLM.
+        
         Returns:
             Confidence score (0.0 to 1.0)
         """
-        if not self.client or not url or not company_name:
+        if not url or not company_name:
             return 0.5
         
+        score = score_linkedin_match(url, company_name)
+        if is_confident(score) or not self.client:
+            return score
+        
         try:
             prompt = f"""Does the LinkedIn URL '{url}' likely belong to the company '{company_name}'?
             
@@ -137,19 +409,22 @@ Consider:
 
 Response (number only):"""
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            score_str = await self._chat(
+                "validate_linkedin",
+                [
                     {"role": "system", "content": "You are a data validation expert."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1,
-                max_tokens=10
+                max_tokens=10,
+                validate=lambda response: self._parse_score(response) is not None
             )
             
-            score_str = response.choices[0].message.content.strip()
-            return float(score_str)
+            llm_score = self._parse_score(score_str)
+            if llm_score is None:
+                logger.warning(f"Unusable LinkedIn validation answer: {score_str!r}")
+                return score
+            return llm_score
         
         except Exception as e:
             logger.error(f"Error validating LinkedIn URL: {str(e)}")
-            return 0.5
+            return score
@@ -1,15 +1,119 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from contextvars import ContextVar
+from typing import Callable, Optional, Dict, Any, List
 from models.company import CompanyData
+from core.http_client import http_client, read_capped, decode_body
+from core.config import get_settings
+from services.politeness import politeness, ThrottledError
+from services.http_cache import http_cache
+from services.circuit_breaker import report_fetch_failure, is_failure_status, THROTTLED
+import aiohttp
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Set by CrawlerOrchestrator for the crawl running in this context; receives
+# fields a crawler publishes before it has finished
+partial_results: ContextVar[Optional[Callable[[Dict[str, Any]], None]]] = ContextVar('partial_results', default=None)
+
 class BaseCrawler(ABC):
     """Abstract base class for all crawlers following Open/Closed Principle"""
     
+    # Query types the crawler accepts, most useful first, and the fields it
+    # can discover; CrawlerOrchestrator schedules crawlers from these
+    consumes: List[str] = []
+    produces: List[str] = []
+    
+    # Per-source time limit in seconds (None uses CRAWLER_TIMEOUT_SECONDS)
+    timeout: Optional[float] = None
+    
+    # Whether failures trip a circuit breaker for the whole source; off for
+    # crawlers whose target site changes with every query
+    circuit_breaker: bool = True
+    
     def __init__(self):
         self.source_name = self.__class__.__name__
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared pooled HTTP session (see core.http_client)"""
+        return http_client.get_session()
+    
+    async def fetch_html(self, url: str, stop_after: Optional[bytes] = None) -> Optional[str]:
+        """
+        Fetch a page through the shared HTTP client
+        
+        The body is streamed and capped at HTTP_MAX_RESPONSE_BYTES. Crawlers that
+        only need part of the page pass stop_after (e.g. b'</head>') to stop
+        reading as soon as it has arrived.
+        
+        Requests are paced per site and checked against robots.txt first,
+        unless the source is listed in ROBOTS_EXEMPT_SOURCES. A fetch whose
+        turn would come after the crawl's deadline is dropped without
+        counting against the circuit breaker.
+        Full-page fetches are revalidated against the HTTP cache, reusing the
+        stored body when the server answers 304 Not Modified.
+        
+        Blocked (403/429/999), server error and network failures are reported
+        to the source's circuit breaker.
+        
+        Returns:
+            Response body as text, or None for non-200 or disallowed responses
+        """
+        settings = get_settings()
+        try:
+            if self.respects_robots() and not await politeness.is_allowed(url, self.headers['User-Agent']):
+                logger.info(f"{self.source_name} skipping {url}: disallowed by robots.txt")
+                return None
+            
+            # Partial reads are never cached, so only full fetches can revalidate
+            cached = await http_cache.get(url) if stop_after is None else None
+            headers = {**self.headers, **http_cache.conditional_headers(cached)}
+            
+            await politeness.wait_turn(url)
+        except ThrottledError as e:
+            logger.info(f"{self.source_name} skipping {url}: {str(e)}")
+            report_fetch_failure(THROTTLED)
+            return None
+        try:
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    await http_cache.touch(url)
+                    return decode_body(http_cache.body(cached), cached.get('charset'))
+                
+                if response.status != 200:
+                    logger.warning(f"{self.source_name} failed to fetch {url}: {response.status}")
+                    if is_failure_status(response.status):
+                        report_fetch_failure(f"HTTP {response.status}")
+                    return None
+                
+                body = await read_capped(response, settings.HTTP_MAX_RESPONSE_BYTES, stop_after)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            report_fetch_failure(type(e).__name__)
+            raise
+        
+        if stop_after is None:
+            await http_cache.store(url, response, body)
+        return decode_body(body, response.charset)
+    
+    def publish(self, data: Dict[str, Any]):
+        """
+        Hand fields known early (e.g. from the homepage) to the crawlers
+        waiting on them, before this crawl has finished; the full result is
+        still returned from crawl()
+        """
+        sink = partial_results.get()
+        if sink is not None:
+            sink(data)
+    
+    def respects_robots(self) -> bool:
+        """Whether fetches of this source are checked against robots.txt"""
+        exempt = {name.strip() for name in get_settings().ROBOTS_EXEMPT_SOURCES.split(',')}
+        return self.source_name not in exempt
     
     @abstractmethod
     async def crawl(self, query: str, query_type: str) -> Optional[Dict[str, Any]]:
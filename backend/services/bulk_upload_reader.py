@@ -0,0 +1,37 @@
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator, List
+import pandas as pd
+
+CSV_EXTENSIONS = ('.csv',)
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+def is_supported_upload(filename: str) -> bool:
+    return filename.endswith(CSV_EXTENSIONS + EXCEL_EXTENSIONS)
+
+async def read_upload_values(upload: UploadFile, chunk_size: int) -> AsyncIterator[List[str]]:
+    """
+    Yield the first column of an uploaded CSV/Excel file in chunks
+    
+    Parsing runs in the threadpool so the event loop stays free. CSV files are
+    read incrementally straight from the spooled upload; Excel workbooks have
+    no streaming reader in pandas, so only the first column is loaded.
+    """
+    if upload.filename.endswith(CSV_EXTENSIONS):
+        reader = await run_in_threadpool(
+            pd.read_csv, upload.file, usecols=[0], dtype=str, chunksize=chunk_size
+        )
+        try:
+            while True:
+                chunk = await run_in_threadpool(next, reader, None)
+                if chunk is None:
+                    break
+                yield chunk.iloc[:, 0].tolist()
+        finally:
+            reader.close()
+    
+    elif upload.filename.endswith(EXCEL_EXTENSIONS):
+        df = await run_in_threadpool(pd.read_excel, upload.file, usecols=[0], dtype=str)
+        values = df.iloc[:, 0].tolist()
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]
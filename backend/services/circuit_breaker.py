@@ -0,0 +1,152 @@
+from core.config import get_settings
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# HTTP statuses that mean the upstream is refusing or failing us, as opposed
+# to "no such page" (LinkedIn answers 999 when it blocks a client)
+FAILURE_STATUSES = {403, 429, 999}
+
+# Failures seen by fetches inside the current crawl; crawlers swallow their
+# own errors, so fetch_html reports blocks here for the orchestrator to see
+fetch_failures: ContextVar[Optional[List[str]]] = ContextVar('fetch_failures', default=None)
+
+# Reported instead of a failure when a fetch was given up because the site's
+# rate limit would have made it miss the crawl deadline; says nothing about
+# the source's health
+THROTTLED = 'throttled'
+
+def report_fetch_failure(reason: str):
+    """Record a failed fetch against the crawl running in this context"""
+    failures = fetch_failures.get()
+    if failures is not None:
+        failures.append(reason)
+
+def is_failure_status(status: int) -> bool:
+    return status in FAILURE_STATUSES or status >= 500
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one crawler source.
+
+    Closed: calls pass through. After `failure_threshold` consecutive
+    failures the breaker opens and rejects calls for `reset_timeout` seconds,
+    then lets a single half-open probe through; a successful probe closes it
+    again and a failed one re-opens it. Error rate and latency are tracked
+    over the last `window` calls for metrics.
+
+    Every admission is tagged with the breaker's generation, which moves on
+    whenever it opens or goes half-open; outcomes of calls admitted in an
+    earlier generation count for metrics only, so a slow call from before
+    the breaker opened cannot close it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, window: int):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.generation = 0
+        self.outcomes: deque = deque(maxlen=window)
+        self.latencies: deque = deque(maxlen=window)
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def allow(self) -> Optional[int]:
+        """
+        Admit a call if the breaker lets it through
+
+        Returns:
+            The generation to pass to record() or release(), or None if the
+            call is rejected. Every admitted call must end in one of them.
+        """
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.generation += 1
+            logger.info(f"Circuit for {self.name} half-open, probing")
+
+        if self.state == CLOSED or (self.state == HALF_OPEN and not self.probe_in_flight):
+            self.probe_in_flight = self.state == HALF_OPEN
+            return self.generation
+
+        self.stats["rejected"] += 1
+        return None
+
+    def record(self, generation: int, success: bool, latency: float):
+        """Record the outcome of a call admitted in `generation`"""
+        self.stats["calls"] += 1
+        self.outcomes.append(success)
+        self.latencies.append(latency)
+        if not success:
+            self.stats["failures"] += 1
+        if generation != self.generation:
+            return
+
+        self.probe_in_flight = False
+        if success:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            return
+
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.stats["opened"] += 1
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = OPEN
+            self.generation += 1
+            self.opened_at = time.monotonic()
+
+    def release(self, generation: int):
+        """Give back an admitted call that ended without an outcome (e.g. cancelled)"""
+        if generation == self.generation:
+            self.probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": round(self.outcomes.count(False) / len(self.outcomes), 3) if self.outcomes else 0.0,
+            "avg_latency": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p95_latency": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+            **self.stats
+        }
+
+class CircuitBreakerRegistry:
+    """Process-wide breakers, one per crawler source"""
+
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.CIRCUIT_BREAKER_RESET_SECONDS,
+                window=settings.CIRCUIT_BREAKER_WINDOW
+            )
+            self.breakers[name] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,90 @@
+from bs4 import BeautifulSoup, NavigableString, Tag
+from typing import Dict, Any, List, Optional
+import re
+
+MAX_EMAILS = 5
+MAX_PHONES = 3
+
+# Emails and US phone numbers, scanned together in a single pass over the text
+CONTACT_PATTERN = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<phone>(?<![\w+])(?:\+?1[-.\s]?)?\(?(?P<area>[0-9]{3})\)?[-.\s]?(?P<prefix>[0-9]{3})[-.\s]?(?P<line>[0-9]{4})\b)'
+)
+
+SOCIAL_PATTERNS = {
+    'linkedin_url': re.compile(r'linkedin\.com/company/', re.IGNORECASE),
+    'twitter_url': re.compile(r'(?:^|[/.])(?:twitter|x)\.com/(?!intent/|share|home\b|hashtag/)', re.IGNORECASE),
+    'facebook_url': re.compile(r'(?:^|[/.])(?:facebook|fb)\.com/(?!sharer|share|dialog/|plugins/)', re.IGNORECASE),
+}
+
+# Image names such as logo@2x.png look like emails
+NON_EMAIL_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
+SKIPPED_TEXT_PARENTS = {'script', 'style', 'noscript', 'template'}
+
+def extract_contacts(soup: BeautifulSoup, hrefs: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Extract social profiles, emails and phone numbers in one walk of the tree
+    
+    Anchors are classified as they are visited (social links, mailto:, tel:)
+    and visible text nodes are collected for one combined regex scan. If
+    `hrefs` is given, every anchor href is appended to it along the way.
+    """
+    socials: Dict[str, str] = {}
+    emails: List[str] = []
+    phones: List[str] = []
+    texts: List[str] = []
+    
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            if node.name == 'a':
+                href = node.get('href')
+                _classify_link(href, socials, emails, phones)
+                if hrefs is not None and href:
+                    hrefs.append(href)
+        elif type(node) is NavigableString and node.parent.name not in SKIPPED_TEXT_PARENTS:
+            texts.append(node)
+    
+    for match in CONTACT_PATTERN.finditer('\n'.join(texts)):
+        if match.group('email'):
+            _add_email(match.group('email'), emails)
+        else:
+            _add_phone(match.group('area'), match.group('prefix'), match.group('line'), phones)
+    
+    data = dict(socials)
+    if emails:
+        data['emails'] = emails[:MAX_EMAILS]
+    if phones:
+        data['phone_numbers'] = phones[:MAX_PHONES]
+    return data
+
+def _classify_link(href: Optional[str], socials: Dict[str, str], emails: List[str], phones: List[str]):
+    if not href:
+        return
+    href = href.strip()
+    lowered = href.lower()
+    
+    if lowered.startswith('mailto:'):
+        _add_email(href[7:].split('?')[0], emails)
+        return
+    
+    if lowered.startswith('tel:'):
+        match = CONTACT_PATTERN.search(href[4:])
+        if match and match.group('phone'):
+            _add_phone(match.group('area'), match.group('prefix'), match.group('line'), phones)
+        return
+    
+    for field, pattern in SOCIAL_PATTERNS.items():
+        if field not in socials and pattern.search(href):
+            socials[field] = href
+            return
+
+def _add_email(email: str, emails: List[str]):
+    email = email.strip()
+    if not email or email.lower().endswith(NON_EMAIL_SUFFIXES) or email in emails:
+        return
+    emails.append(email)
+
+def _add_phone(area: str, prefix: str, line: str, phones: List[str]):
+    phone = f"+1-{area}-{prefix}-{line}"
+    if phone not in phones:
+        phones.append(phone)
@@ -29,11 +29,7 @@ class ContentService:
             )
         
         blog = Blog(**blog_data.model_dump())
-        blog_dict = blog.model_dump()
-        blog_dict['created_at'] = blog_dict['created_at'].isoformat()
-        blog_dict['updated_at'] = blog_dict['updated_at'].isoformat()
-        
-        await self.blogs.insert_one(blog_dict)
+        await self.blogs.insert_one(blog.model_dump())
         
         logger.info(f"Created blog: {blog.slug}")
         return blog
@@ -46,10 +42,6 @@ class ContentService:
         if not blog_dict:
             return None
         
-        for field in ['created_at', 'updated_at']:
-            if isinstance(blog_dict[field], str):
-                blog_dict[field] = datetime.fromisoformat(blog_dict[field])
-        
         return Blog(**blog_dict)
     
     async def get_all_blogs(self, published_only: bool = True) -> List[Blog]:
@@ -59,14 +51,7 @@ class ContentService:
         query = {"is_published": True} if published_only else {}
         blogs_list = await self.blogs.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
         
-        result = []
-        for blog in blogs_list:
-            for field in ['created_at', 'updated_at']:
-                if isinstance(blog[field], str):
-                    blog[field] = datetime.fromisoformat(blog[field])
-            result.append(Blog(**blog))
-        
-        return result
+        return [Blog(**blog) for blog in blogs_list]
     
     async def update_blog(self, slug: str, blog_data: BlogUpdate) -> Optional[Blog]:
         """
@@ -76,7 +61,7 @@ class ContentService:
         if not update_data:
             return await self.get_blog(slug)
         
-        update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        update_data['updated_at'] = datetime.now(timezone.utc)
         
         result = await self.blogs.update_one(
             {"slug": slug},
@@ -100,11 +85,7 @@ class ContentService:
         Create a new FAQ
         """
         faq = FAQ(**faq_data.model_dump())
-        faq_dict = faq.model_dump()
-        faq_dict['created_at'] = faq_dict['created_at'].isoformat()
-        faq_dict['updated_at'] = faq_dict['updated_at'].isoformat()
-        
-        await self.faqs.insert_one(faq_dict)
+        await self.faqs.insert_one(faq.model_dump())
         
         logger.info(f"Created FAQ: {faq.id}")
         return faq
@@ -117,10 +98,6 @@ class ContentService:
         if not faq_dict:
             return None
         
-        for field in ['created_at', 'updated_at']:
-            if isinstance(faq_dict[field], str):
-                faq_dict[field] = datetime.fromisoformat(faq_dict[field])
-        
         return FAQ(**faq_dict)
     
     async def get_all_faqs(self, published_only: bool = True) -> List[FAQ]:
@@ -130,14 +107,7 @@ class ContentService:
         query = {"is_published": True} if published_only else {}
         faqs_list = await self.faqs.find(query, {"_id": 0}).sort("order", 1).to_list(100)
         
-        result = []
-        for faq in faqs_list:
-            for field in ['created_at', 'updated_at']:
-                if isinstance(faq[field], str):
-                    faq[field] = datetime.fromisoformat(faq[field])
-            result.append(FAQ(**faq))
-        
-        return result
+        return [FAQ(**faq) for faq in faqs_list]
     
     async def update_faq(self, faq_id: str, faq_data: FAQUpdate) -> Optional[FAQ]:
         """
@@ -147,7 +117,7 @@ class ContentService:
         if not update_data:
             return await self.get_faq(faq_id)
         
-        update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        update_data['updated_at'] = datetime.now(timezone.utc)
         
         result = await self.faqs.update_one(
             {"id": faq_id},
@@ -0,0 +1,221 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from models.company import CrawlJob
+from core.config import get_settings
+from core.database import get_db
+from typing import List, Optional, Dict, Any
+import logging
+from datetime import datetime, timezone, timedelta
+import asyncio
+
+logger = logging.getLogger(__name__)
+
+# Jobs are claimed by (priority, created_at): interactive requests jump ahead
+# of queued bulk rows instead of waiting behind a large upload
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+class CrawlQueue:
+    """
+    Durable crawl job queue backed by the crawl_jobs collection.
+    
+    Jobs are claimed atomically with a lease, so a job held by a worker that
+    died (or a process that restarted) becomes claimable again once its lease
+    expires. A fixed pool of workers bounds the number of concurrent crawls.
+    Jobs whose lease expired on their last attempt are failed by a periodic
+    sweep, which also settles their credits.
+    """
+    
+    def __init__(self):
+        self.workers: List[asyncio.Task] = []
+        self.crawl_service = None
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    @property
+    def jobs(self):
+        return get_db().crawl_jobs
+    
+    async def start(self, db: AsyncIOMotorDatabase):
+        """Start the worker pool"""
+        # Imported here to avoid a cycle: CrawlService enqueues onto this queue
+        from services.crawl_service import CrawlService
+        
+        settings = get_settings()
+        self.crawl_service = CrawlService(db)
+        self._wakeup = asyncio.Event()
+        self.workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(settings.CRAWL_WORKER_CONCURRENCY)
+        ]
+        self.workers.append(asyncio.create_task(self._sweeper()))
+        logger.info(f"Started crawl queue with {settings.CRAWL_WORKER_CONCURRENCY} workers")
+    
+    async def stop(self):
+        """Stop the worker pool, releasing in-flight jobs back to the queue"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        logger.info("Stopped crawl queue")
+    
+    async def enqueue(self, request_id: str, user_id: str, priority: int = PRIORITY_INTERACTIVE) -> CrawlJob:
+        """
+        Add a crawl request to the queue
+        """
+        job = CrawlJob(request_id=request_id, user_id=user_id, priority=priority)
+        await self.jobs.insert_one(job.model_dump())
+        self._notify()
+        return job
+    
+    async def enqueue_many(self, request_ids: List[str], user_id: str, priority: int = PRIORITY_BULK) -> int:
+        """
+        Add a batch of crawl requests to the queue in a single insert
+        """
+        if not request_ids:
+            return 0
+        
+        job_dicts = [
+            CrawlJob(request_id=request_id, user_id=user_id, priority=priority).model_dump()
+            for request_id in request_ids
+        ]
+        
+        await self.jobs.insert_many(job_dicts, ordered=False)
+        self._notify()
+        return len(job_dicts)
+    
+    def _notify(self):
+        """Wake idle workers"""
+        if self._wakeup:
+            self._wakeup.set()
+    
+    async def _claim_job(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the most urgent runnable job, oldest first
+        """
+        settings = get_settings()
+        now = datetime.now(timezone.utc)
+        lease_expires_at = now + timedelta(seconds=settings.CRAWL_JOB_LEASE_SECONDS)
+        
+        return await self.jobs.find_one_and_update(
+            {
+                "attempts": {"$lt": settings.CRAWL_JOB_MAX_ATTEMPTS},
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {"status": "running", "lease_expires_at": lease_expires_at},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("priority", 1), ("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _sweep_exhausted_jobs(self) -> int:
+        """
+        Fail jobs whose lease expired with no attempts left
+        
+        Such jobs can never be claimed again; without this they would stay
+        running forever and their credits would never be settled.
+        """
+        settings = get_settings()
+        swept = 0
+        
+        while True:
+            now = datetime.now(timezone.utc)
+            error = f"Lease expired after {settings.CRAWL_JOB_MAX_ATTEMPTS} attempts"
+            job = await self.jobs.find_one_and_update(
+                {
+                    "status": "running",
+                    "lease_expires_at": {"$lt": now},
+                    "attempts": {"$gte": settings.CRAWL_JOB_MAX_ATTEMPTS}
+                },
+                {"$set": {"status": "failed", "error": error, "completed_at": now}}
+            )
+            if not job:
+                return swept
+            
+            logger.warning(f"Crawl job {job['id']} abandoned: {error}")
+            await self.crawl_service.fail_abandoned_request(job['request_id'], job['user_id'], error)
+            swept += 1
+    
+    async def _sweeper(self):
+        """
+        Periodically fail abandoned jobs until cancelled
+        """
+        settings = get_settings()
+        while True:
+            try:
+                await self._sweep_exhausted_jobs()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Crawl queue sweep failed: {str(e)}")
+            await asyncio.sleep(settings.CRAWL_QUEUE_SWEEP_INTERVAL)
+    
+    async def _worker(self, worker_id: int):
+        """
+        Claim and run jobs until cancelled
+        """
+        settings = get_settings()
+        
+        while True:
+            try:
+                self._wakeup.clear()
+                job = await self._claim_job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Crawl worker {worker_id} failed to claim job: {str(e)}")
+                job = None
+            
+            if not job:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.CRAWL_QUEUE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            await self._run_job(job)
+    
+    async def _run_job(self, job: Dict[str, Any]):
+        """
+        Run a claimed job and record its outcome
+        """
+        try:
+            await self.crawl_service._process_crawl_request(job['request_id'], job['user_id'])
+        
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without charging an attempt
+            await self.jobs.update_one(
+                {"id": job['id']},
+                {"$set": {"status": "queued", "lease_expires_at": None}, "$inc": {"attempts": -1}}
+            )
+            raise
+        
+        except Exception as e:
+            logger.error(f"Crawl job {job['id']} failed: {str(e)}")
+            await self.jobs.update_one(
+                {"id": job['id']},
+                {
+                    "$set": {
+                        "status": "failed",
+                        "error": str(e),
+                        "completed_at": datetime.now(timezone.utc)
+                    }
+                }
+            )
+            return
+        
+        await self.jobs.update_one(
+            {"id": job['id']},
+            {
+                "$set": {
+                    "status": "completed",
+                    "completed_at": datetime.now(timezone.utc)
+                }
+            }
+        )
+
+crawl_queue = CrawlQueue()
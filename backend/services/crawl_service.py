@@ -2,10 +2,13 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.company import CrawlRequest, BulkCrawlJob, CompanyData, CrawlRequestCreate
 from services.crawler_orchestrator import CrawlerOrchestrator
 from services.user_service import UserService
-from typing import List, Optional
-import logging
-from datetime import datetime, timezone
+from services.crawl_queue import crawl_queue
+from services.input_normalizer import normalize_input_value, input_key
+from core.config import get_settings
+from typing import Any, AsyncIterator, Dict, List, Optional
 import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
@@ -26,79 +29,304 @@ class CrawlService:
         """
         Create a single crawl request
         """
-        # Check user credits
-        credits = await self.user_service.get_user_credits(user_id)
-        if credits < 1:
+        # Reserve the credit up front; it is refunded if the crawl fails
+        if not await self.user_service.reserve_credits(user_id, 1):
             raise HTTPException(
                 status_code=status.HTTP_402_PAYMENT_REQUIRED,
                 detail="Insufficient credits"
             )
         
-        # Create request
-        crawl_request = CrawlRequest(
+        try:
+            # Create request
+            crawl_request = CrawlRequest(
+                user_id=user_id,
+                input_type=request_data.input_type,
+                input_value=request_data.input_value,
+                status="pending",
+                credit_reserved=True,
+                force_refresh=request_data.force_refresh
+            )
+            
+            # Serve fresh ledger records without crawling
+            cached = None
+            if not request_data.force_refresh:
+                cached = await self._find_fresh_ledger_entry(
+                    request_data.input_type, request_data.input_value, user_id
+                )
+            
+            if cached:
+                crawl_request.status = "completed"
+                crawl_request.result = cached
+                crawl_request.cache_hit = True
+                crawl_request.completed_at = datetime.now(timezone.utc)
+            
+            request_dict = crawl_request.model_dump()
+            if cached:
+                request_dict['result'] = self._serialize_result(cached)
+            
+            await self.crawl_requests.insert_one(request_dict)
+        except Exception:
+            await self.user_service.release_credits(user_id, 1)
+            raise
+        
+        if cached:
+            logger.info(f"Served crawl request {crawl_request.id} from central ledger")
+            return crawl_request
+        
+        # Hand off to the crawl worker pool
+        try:
+            await crawl_queue.enqueue(crawl_request.id, user_id)
+        except Exception:
+            # The request never reached the queue and will not run
+            await self.crawl_requests.update_one(
+                {"id": crawl_request.id},
+                {"$set": {"status": "failed", "error": "Not queued", "completed_at": datetime.now(timezone.utc)}}
+            )
+            await self.user_service.release_credits(user_id, 1)
+            raise
+        
+        logger.info(f"Created crawl request {crawl_request.id} for user {user_id}")
+        return crawl_request
+    
+    async def create_bulk_crawl_job(
+        self,
+        user_id: str,
+        input_type: str,
+        filename: str,
+        value_batches: AsyncIterator[List[str]],
+        force_refresh: bool = False
+    ) -> BulkCrawlJob:
+        """
+        Create a bulk crawl job from batches of raw input values
+        
+        Values are normalized and deduplicated, then written with one
+        insert_many per batch for both requests and queue jobs. Credits are
+        reserved once per batch; rows beyond the user's balance are skipped
+        and unused reservations are refunded when the job finishes.
+        
+        If reading the upload fails part-way, the batches already queued
+        still run: the job is finalized with what was queued and the error
+        is recorded on it.
+        """
+        bulk_job = BulkCrawlJob(
             user_id=user_id,
-            input_type=request_data.input_type,
-            input_value=request_data.input_value,
-            status="pending"
+            total_requests=0,
+            input_filename=filename
         )
         
-        request_dict = crawl_request.model_dump()
-        request_dict['created_at'] = request_dict['created_at'].isoformat()
+        await self.bulk_jobs.insert_one(bulk_job.model_dump())
         
-        await self.crawl_requests.insert_one(request_dict)
+        seen = set()
+        total = 0
+        reserved = 0
+        skipped = 0
         
-        # Process request asynchronously
-        asyncio.create_task(self._process_crawl_request(crawl_request.id, user_id))
+        try:
+            async for raw_values in value_batches:
+                request_dicts = []
+                for raw_value in raw_values:
+                    value = normalize_input_value(input_type, raw_value)
+                    if not value:
+                        continue
+                    
+                    key = input_key(input_type, value)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    
+                    request_dict = CrawlRequest(
+                        user_id=user_id,
+                        input_type=input_type,
+                        input_value=value,
+                        bulk_job_id=bulk_job.id,
+                        credit_reserved=True,
+                        force_refresh=force_refresh
+                    ).model_dump()
+                    request_dicts.append(request_dict)
+                
+                if not request_dicts:
+                    continue
+                
+                if skipped:
+                    # Out of credits: keep counting the remaining rows only
+                    skipped += len(request_dicts)
+                    continue
+                
+                granted = await self.user_service.reserve_credits(user_id, len(request_dicts))
+                if granted < len(request_dicts):
+                    skipped += len(request_dicts) - granted
+                    request_dicts = request_dicts[:granted]
+                
+                if request_dicts:
+                    # Record the reservation before workers can settle against it;
+                    # anything not queued below is refunded when the job finishes
+                    reserved += granted
+                    await self.bulk_jobs.update_one({"id": bulk_job.id}, {"$inc": {"reserved_credits": granted}})
+                    request_ids = [r['id'] for r in request_dicts]
+                    try:
+                        await self.crawl_requests.insert_many(request_dicts, ordered=False)
+                        await crawl_queue.enqueue_many(request_ids, user_id)
+                    except Exception:
+                        # These rows never reached the queue and will not run
+                        await self.crawl_requests.update_many(
+                            {"id": {"$in": request_ids}},
+                            {"$set": {"status": "failed", "error": "Not queued", "completed_at": datetime.now(timezone.utc)}}
+                        )
+                        raise
+                    total += len(request_dicts)
         
-        logger.info(f"Created crawl request {crawl_request.id} for user {user_id}")
-        return crawl_request
+        except Exception as e:
+            logger.error(f"Bulk job {bulk_job.id} stopped reading {filename} after {total} rows: {str(e)}")
+            bulk_job.error = str(e)
+        
+        if not total and skipped and not bulk_job.error:
+            await self.bulk_jobs.delete_one({"id": bulk_job.id})
+            raise HTTPException(
+                status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                detail="Insufficient credits"
+            )
+        
+        bulk_job.total_requests = total
+        bulk_job.skipped_requests = skipped
+        bulk_job.reserved_credits = reserved
+        bulk_job.status = "processing"
+        await self.bulk_jobs.update_one(
+            {"id": bulk_job.id},
+            {
+                "$set": {
+                    "total_requests": total,
+                    "skipped_requests": skipped,
+                    "status": bulk_job.status,
+                    "error": bulk_job.error
+                }
+            }
+        )
+        
+        # Completes the job (and refunds unused credits) if every request
+        # has already finished, including when nothing was queued
+        await self._refresh_bulk_job_status(bulk_job.id)
+        
+        logger.info(f"Created bulk job {bulk_job.id} with {total} crawl requests for user {user_id}")
+        return bulk_job
+    
+    async def get_bulk_job(self, job_id: str, user_id: str) -> Optional[BulkCrawlJob]:
+        """
+        Get bulk crawl job by ID
+        """
+        job_dict = await self.bulk_jobs.find_one(
+            {"id": job_id, "user_id": user_id},
+            {"_id": 0}
+        )
+        
+        if not job_dict:
+            return None
+        
+        return BulkCrawlJob(**job_dict)
+    
+    async def _record_bulk_progress(self, bulk_job_id: str, succeeded: bool):
+        """
+        Count a finished request against its bulk job
+        """
+        counter = "completed_requests" if succeeded else "failed_requests"
+        await self.bulk_jobs.update_one({"id": bulk_job_id}, {"$inc": {counter: 1}})
+        await self._refresh_bulk_job_status(bulk_job_id)
+    
+    async def _refresh_bulk_job_status(self, bulk_job_id: str):
+        """
+        Mark a bulk job completed once every request has finished and refund
+        the credits reserved for requests that failed
+        """
+        finished = await self.bulk_jobs.find_one_and_update(
+            {
+                "id": bulk_job_id,
+                "status": "processing",
+                "$expr": {
+                    "$gte": [
+                        {"$add": ["$completed_requests", "$failed_requests"]},
+                        "$total_requests"
+                    ]
+                }
+            },
+            {
+                "$set": {
+                    "status": "completed",
+                    "completed_at": datetime.now(timezone.utc)
+                }
+            },
+            projection={"_id": 0, "user_id": 1, "reserved_credits": 1, "completed_requests": 1}
+        )
+        
+        if finished:
+            unused = finished.get('reserved_credits', 0) - finished['completed_requests']
+            await self.user_service.release_credits(finished['user_id'], unused)
     
     async def _process_crawl_request(self, request_id: str, user_id: str):
         """
-        Process a crawl request (background task)
+        Process a crawl request (crawl queue worker body)
         """
+        request_dict = None
+        succeeded = False
         try:
-            # Update status to processing
-            await self.crawl_requests.update_one(
-                {"id": request_id},
+            # Update status to processing, unless a previous attempt already
+            # finished (and settled) this request
+            request_dict = await self.crawl_requests.find_one_and_update(
+                {"id": request_id, "status": {"$nin": ["completed", "failed"]}},
                 {"$set": {"status": "processing"}}
             )
-            
-            # Get request details
-            request_dict = await self.crawl_requests.find_one({"id": request_id})
             if not request_dict:
                 return
             
-            # Perform crawl
-            company_data = await self.orchestrator.crawl_company(
-                query=request_dict['input_value'],
-                query_type=request_dict['input_type'],
-                user_id=user_id
-            )
+            # Check the central ledger before crawling
+            company_data = None
+            if not request_dict.get('force_refresh'):
+                company_data = await self._find_fresh_ledger_entry(
+                    request_dict['input_type'], request_dict['input_value'], user_id
+                )
+            cache_hit = company_data is not None
             
-            # Update central ledger
-            await self._update_central_ledger(company_data)
+            if not cache_hit:
+                # Perform crawl
+                settings = get_settings()
+                is_bulk = bool(request_dict.get('bulk_job_id'))
+                company_data = await self.orchestrator.crawl_company(
+                    query=request_dict['input_value'],
+                    query_type=request_dict['input_type'],
+                    user_id=user_id,
+                    deadline=settings.CRAWL_BULK_DEADLINE_SECONDS if is_bulk else settings.CRAWL_DEADLINE_SECONDS,
+                    batch_enrichment=is_bulk
+                )
+                
+                # Update central ledger
+                await self._update_central_ledger(
+                    company_data, request_dict['input_type'], request_dict['input_value']
+                )
             
             # Update request with result
-            result_dict = company_data.model_dump()
-            result_dict['last_crawled'] = result_dict['last_crawled'].isoformat()
-            
             await self.crawl_requests.update_one(
                 {"id": request_id},
                 {
                     "$set": {
                         "status": "completed",
-                        "result": result_dict,
-                        "completed_at": datetime.now(timezone.utc).isoformat()
+                        "result": self._serialize_result(company_data),
+                        "cache_hit": cache_hit,
+                        "completed_at": datetime.now(timezone.utc)
                     }
                 }
             )
             
-            # Deduct credits
-            await self.user_service.update_credits(user_id, -1)
+            # Deduct credits unless they were reserved when the request was created
+            if not request_dict.get('credit_reserved'):
+                await self.user_service.update_credits(user_id, -1)
             
+            succeeded = True
             logger.info(f"Completed crawl request {request_id}")
         
+        except asyncio.CancelledError:
+            # Shutting down: the queue hands the job back for a retry, which
+            # settles the request instead
+            request_dict = None
+            raise
+        
         except Exception as e:
             logger.error(f"Error processing crawl request {request_id}: {str(e)}")
             await self.crawl_requests.update_one(
@@ -107,12 +335,102 @@ class CrawlService:
                     "$set": {
                         "status": "failed",
                         "error": str(e),
-                        "completed_at": datetime.now(timezone.utc).isoformat()
+                        "completed_at": datetime.now(timezone.utc)
                     }
                 }
             )
+        
+        finally:
+            # Settle even if recording the failure raised, so the reserved
+            # credit is not stranded
+            if request_dict:
+                await self._settle_request(request_dict, user_id, succeeded)
     
-    async def _update_central_ledger(self, company_data: CompanyData):
+    async def fail_abandoned_request(self, request_id: str, user_id: str, error: str):
+        """
+        Fail a request whose queue job ran out of attempts, settling its credit
+        """
+        request_dict = await self.crawl_requests.find_one_and_update(
+            {"id": request_id, "status": {"$nin": ["completed", "failed"]}},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": error,
+                    "completed_at": datetime.now(timezone.utc)
+                }
+            }
+        )
+        if request_dict:
+            await self._settle_request(request_dict, user_id, False)
+    
+    async def _settle_request(self, request_dict: Dict[str, Any], user_id: str, succeeded: bool):
+        """
+        Count a finished request against its bulk job, or refund its credit
+        """
+        if request_dict.get('bulk_job_id'):
+            # Bulk reservations are settled once the whole job finishes
+            await self._record_bulk_progress(request_dict['bulk_job_id'], succeeded)
+        elif request_dict.get('credit_reserved') and not succeeded:
+            await self.user_service.release_credits(user_id, 1)
+    
+    def _serialize_result(self, company_data: CompanyData) -> dict:
+        """
+        Convert CompanyData to its stored form
+        """
+        return company_data.model_dump()
+    
+    def _ledger_lookup_keys(self, company_data: CompanyData, query_type: str, query: str) -> List[str]:
+        """
+        Normalized keys under which a ledger record can be found again
+        
+        Only the query itself and identifiers that pin down one company are
+        used. A scraped company_name is often just the page title ("Home",
+        "Welcome") and would match unrelated companies.
+        """
+        candidates = [
+            ('domain', company_data.domain),
+            ('linkedin_url', company_data.linkedin_url),
+            (query_type, query)
+        ]
+        
+        keys = []
+        for input_type, value in candidates:
+            value = normalize_input_value(input_type, value)
+            if value:
+                keys.append(input_key(input_type, value))
+        return list(dict.fromkeys(keys))
+    
+    async def _find_fresh_ledger_entry(self, input_type: str, input_value: str, user_id: str) -> Optional[CompanyData]:
+        """
+        Find a ledger record for the query crawled within LEDGER_CACHE_TTL_HOURS
+        
+        The newest matching record is used. It is returned as a fresh result
+        for `user_id`, without the id and user of the crawl that stored it.
+        """
+        settings = get_settings()
+        if settings.LEDGER_CACHE_TTL_HOURS <= 0:
+            return None
+        
+        value = normalize_input_value(input_type, input_value)
+        if not value:
+            return None
+        
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.LEDGER_CACHE_TTL_HOURS)
+        comp = await self.central_ledger.find_one(
+            {
+                "lookup_keys": input_key(input_type, value),
+                "last_crawled": {"$gte": cutoff}
+            },
+            {"_id": 0, "lookup_keys": 0, "id": 0, "crawled_by_user": 0},
+            sort=[("last_crawled", -1)]
+        )
+        
+        if not comp:
+            return None
+        
+        return CompanyData(**comp, crawled_by_user=user_id)
+    
+    async def _update_central_ledger(self, company_data: CompanyData, query_type: str, query: str):
         """
         Update central ledger with crawled company data
         """
@@ -121,13 +439,20 @@ class CrawlService:
         if not identifier:
             return
         
-        company_dict = company_data.model_dump()
-        company_dict['last_crawled'] = company_dict['last_crawled'].isoformat()
+        company_dict = self._serialize_result(company_data)
+        if not company_data.domain:
+            # Keep the identifier the record is keyed on
+            company_dict.pop('domain', None)
         
         # Upsert to central ledger
         await self.central_ledger.update_one(
             {"domain": identifier},
-            {"$set": company_dict},
+            {
+                "$set": company_dict,
+                "$addToSet": {
+                    "lookup_keys": {"$each": self._ledger_lookup_keys(company_data, query_type, query)}
+                }
+            },
             upsert=True
         )
     
@@ -143,18 +468,6 @@ class CrawlService:
         if not request_dict:
             return None
         
-        # Convert timestamps
-        for field in ['created_at', 'completed_at']:
-            if request_dict.get(field) and isinstance(request_dict[field], str):
-                request_dict[field] = datetime.fromisoformat(request_dict[field])
-        
-        # Convert result if exists
-        if request_dict.get('result'):
-            result = request_dict['result']
-            if isinstance(result['last_crawled'], str):
-                result['last_crawled'] = datetime.fromisoformat(result['last_crawled'])
-            request_dict['result'] = CompanyData(**result)
-        
         return CrawlRequest(**request_dict)
     
     async def get_user_requests(self, user_id: str, limit: int = 50) -> List[CrawlRequest]:
@@ -166,21 +479,7 @@ class CrawlService:
             {"_id": 0}
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
-        result = []
-        for req in requests_list:
-            for field in ['created_at', 'completed_at']:
-                if req.get(field) and isinstance(req[field], str):
-                    req[field] = datetime.fromisoformat(req[field])
-            
-            if req.get('result'):
-                res = req['result']
-                if isinstance(res['last_crawled'], str):
-                    res['last_crawled'] = datetime.fromisoformat(res['last_crawled'])
-                req['result'] = CompanyData(**res)
-            
-            result.append(CrawlRequest(**req))
-        
-        return result
+        return [CrawlRequest(**req) for req in requests_list]
     
     async def search_central_ledger(self, query: str, limit: int = 10) -> List[CompanyData]:
         """
@@ -196,10 +495,4 @@ class CrawlService:
         
         companies = await self.central_ledger.find(search_filter, {"_id": 0}).limit(limit).to_list(limit)
         
-        result = []
-        for comp in companies:
-            if isinstance(comp['last_crawled'], str):
-                comp['last_crawled'] = datetime.fromisoformat(comp['last_crawled'])
-            result.append(CompanyData(**comp))
-        
-        return result
+        return [CompanyData(**comp) for comp in companies]
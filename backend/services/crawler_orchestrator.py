@@ -1,18 +1,26 @@
-from typing import Dict, Any, List, Optional
-from services.base_crawler import BaseCrawler
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from services.base_crawler import BaseCrawler, partial_results
 from services.website_crawler import WebsiteCrawler
 from services.linkedin_crawler import LinkedInCrawler
 from services.news_crawler import NewsCrawler
 from services.ai_service import AIService
+from services.input_normalizer import normalize_input_value, input_key
+from services.circuit_breaker import circuit_breakers, fetch_failures, THROTTLED
+from services.politeness import fetch_deadline
 from models.company import CompanyData
+from core.config import get_settings
 import logging
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 
 class CrawlerOrchestrator:
     """Orchestrates multiple crawlers following Dependency Inversion Principle"""
     
+    # Crawls in progress, keyed by normalized query and shared by all instances
+    _inflight: Dict[str, asyncio.Task] = {}
+    
     def __init__(self):
         # Initialize crawlers in priority order
         self.crawlers: List[BaseCrawler] = [
@@ -22,7 +30,14 @@ class CrawlerOrchestrator:
         ]
         self.ai_service = AIService()
     
-    async def crawl_company(self, query: str, query_type: str, user_id: str) -> CompanyData:
+    async def crawl_company(
+        self,
+        query: str,
+        query_type: str,
+        user_id: str,
+        deadline: Optional[float] = None,
+        batch_enrichment: bool = False
+    ) -> CompanyData:
         """
         Orchestrate crawling from multiple sources
         
@@ -30,34 +45,75 @@ class CrawlerOrchestrator:
             query: Search query
             query_type: Type of query ('company_name', 'domain', 'linkedin_url')
             user_id: User ID for tracking
+            deadline: End-to-end budget in seconds (default CRAWL_DEADLINE_SECONDS)
+            batch_enrichment: Enrich in a micro-batch with other pending crawls
+                (bulk jobs) instead of with a call of its own
         
         Returns:
             CompanyData with aggregated information
+        
+        Concurrent calls for the same normalized query share a single crawl
+        (run under the first caller's settings); each caller receives its
+        own copy of the result.
         """
-        logger.info(f"Starting crawl for {query} (type: {query_type})")
+        normalized = normalize_input_value(query_type, query)
+        key = input_key(query_type, normalized) if normalized else None
         
-        # Collect data from all sources
-        all_data = {}
-        data_sources = []
+        task = self._inflight.get(key) if key else None
+        if task:
+            logger.info(f"Attaching to in-flight crawl for {query} (type: {query_type})")
+        else:
+            task = asyncio.create_task(self._crawl_company(query, query_type, deadline, batch_enrichment))
+            if key:
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded so one caller being cancelled does not cancel the shared crawl
+        company_data = await asyncio.shield(task)
+        return company_data.model_copy(deep=True, update={"crawled_by_user": user_id})
+    
+    async def _crawl_company(
+        self,
+        query: str,
+        query_type: str,
+        deadline: Optional[float] = None,
+        batch_enrichment: bool = False
+    ) -> CompanyData:
+        """
+        Run the crawlers and AI enrichment for a single query
         
-        # Run crawlers in parallel with priority
-        tasks = []
-        for crawler in self.crawlers:
-            tasks.append(self._safe_crawl(crawler, query, query_type))
+        The budget is split between stages: crawlers must finish before the
+        time reserved for AI enrichment, and whatever has finished by then is
+        used. Enrichment gets the rest of the budget, capped at
+        AI_TIMEOUT_SECONDS (AI_BATCH_TIMEOUT_SECONDS when batched).
+        """
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        budget = deadline or settings.CRAWL_DEADLINE_SECONDS
+        ends_at = loop.time() + budget
+        ai_cap = settings.AI_BATCH_TIMEOUT_SECONDS if batch_enrichment else settings.AI_TIMEOUT_SECONDS
+        ai_reserve = min(ai_cap, budget / 3)
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Starting crawl for {query} (type: {query_type}, budget {budget:.0f}s)")
         
-        # Aggregate results
-        for i, result in enumerate(results):
-            if isinstance(result, dict) and result:
-                crawler_name = self.crawlers[i].source_name
-                data_sources.append(crawler_name)
-                all_data = self._merge_data(all_data, result)
+        # Collect data from all sources
+        all_data, data_sources = await self._run_crawl_dag(query, query_type, ends_at - ai_reserve)
         
         # Use AI to enrich and validate data
-        if all_data:
-            enriched_data = await self.ai_service.enrich_company_data(all_data, query, query_type)
-            all_data = self._merge_data(all_data, enriched_data)
+        ai_timeout = min(ai_cap, ends_at - loop.time())
+        if all_data and ai_timeout > 0:
+            enrich = (
+                self.ai_service.enrich_company_data_batched if batch_enrichment
+                else self.ai_service.enrich_company_data
+            )
+            try:
+                enriched_data = await asyncio.wait_for(
+                    enrich(all_data, query, query_type),
+                    timeout=ai_timeout
+                )
+                all_data = self._merge_data(all_data, enriched_data)
+            except asyncio.TimeoutError:
+                logger.warning(f"AI enrichment for {query} timed out after {ai_timeout:.1f}s")
         
         # Calculate confidence score
         confidence = self._calculate_overall_confidence(all_data, len(data_sources))
@@ -66,20 +122,195 @@ class CrawlerOrchestrator:
         company_data = CompanyData(
             **all_data,
             confidence_score=confidence,
-            data_sources=data_sources,
-            crawled_by_user=user_id
+            data_sources=data_sources
         )
         
         logger.info(f"Crawl completed for {query}. Confidence: {confidence:.2f}")
         return company_data
     
-    async def _safe_crawl(self, crawler: BaseCrawler, query: str, query_type: str) -> Optional[Dict[str, Any]]:
-        """Safely execute crawler with error handling"""
-        try:
-            return await crawler.crawl(query, query_type)
-        except Exception as e:
-            logger.error(f"Error in {crawler.source_name}: {str(e)}")
+    async def _run_crawl_dag(self, query: str, query_type: str, ends_at: float) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run crawlers as their inputs become available
+        
+        Each crawler starts as soon as its most useful input (per `consumes`)
+        is known, or as soon as no running crawler can still produce a better
+        one. Fields discovered by one crawler (e.g. a company name or
+        LinkedIn URL found on the website) feed the crawlers waiting on them,
+        as soon as the crawler publishes them (see BaseCrawler.publish) or
+        otherwise when it finishes. A crawler that has published no longer
+        holds back the crawlers waiting on its fields.
+        
+        Each crawler runs under its own timeout, clipped to `ends_at` (event
+        loop time); crawlers still running at `ends_at` are cancelled.
+        Sources whose circuit breaker is open are skipped outright.
+        
+        Returns:
+            Merged data and the names of the sources that returned data
+        """
+        loop = asyncio.get_running_loop()
+        inputs = {query_type: query}
+        all_data: Dict[str, Any] = {}
+        data_sources: List[str] = []
+        
+        waiting = list(self.crawlers)
+        running: Dict[asyncio.Task, BaseCrawler] = {}
+        published: List[BaseCrawler] = []
+        wakeup = asyncio.Event()
+        force = False
+        
+        def sink_for(crawler: BaseCrawler):
+            def sink(data: Dict[str, Any]):
+                for field in crawler.produces:
+                    if data.get(field) and field not in inputs:
+                        inputs[field] = data[field]
+                published.append(crawler)
+                wakeup.set()
+            return sink
+        
+        while True:
+            for crawler in list(waiting):
+                producers = [c for c in running.values() if c not in published]
+                decision = self._select_input(crawler, inputs, waiting, producers, force)
+                if decision == 'wait':
+                    continue
+                
+                waiting.remove(crawler)
+                remaining = ends_at - loop.time()
+                if decision is not None and remaining > 0:
+                    input_type, input_value = decision
+                    timeout = min(self._source_timeout(crawler), remaining)
+                    task = asyncio.create_task(
+                        self._safe_crawl(crawler, input_value, input_type, timeout, sink_for(crawler))
+                    )
+                    running[task] = crawler
+            
+            if not running:
+                if not waiting or force:
+                    break
+                # Crawlers waiting on each other: start them with what is known
+                force = True
+                continue
+            force = False
+            
+            wakeup.clear()
+            woken = asyncio.create_task(wakeup.wait())
+            try:
+                done, _ = await asyncio.wait(
+                    [*running, woken], timeout=max(0, ends_at - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                woken.cancel()
+            done.discard(woken)
+            if not done and wakeup.is_set():
+                # A running crawler published fields; schedule the waiters
+                continue
+            if not done:
+                # Out of time: keep what has finished, drop the rest
+                logger.warning(
+                    f"Crawl budget exhausted for {query}; cancelling {[c.source_name for c in running.values()]}"
+                )
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                break
+            
+            for task in done:
+                crawler = running.pop(task)
+                result = task.result()
+                if not result:
+                    continue
+                
+                data_sources.append(crawler.source_name)
+                all_data = self._merge_data(all_data, result)
+                for field in crawler.produces:
+                    if result.get(field) and field not in inputs:
+                        inputs[field] = result[field]
+        
+        if waiting:
+            logger.info(f"Skipped {[c.source_name for c in waiting]} for {query}: no usable input")
+        
+        return all_data, data_sources
+    
+    def _select_input(
+        self,
+        crawler: BaseCrawler,
+        inputs: Dict[str, Any],
+        waiting: List[BaseCrawler],
+        running,
+        force: bool = False
+    ) -> Optional[Any]:
+        """
+        Decide how a crawler should be scheduled
+        
+        Returns:
+            (input_type, value) to start now, 'wait' if a preferred input may
+            still be produced, or None if the crawler can never run
+        """
+        producers = [c for c in list(waiting) + list(running) if c is not crawler]
+        
+        for field in crawler.consumes:
+            if inputs.get(field):
+                return field, inputs[field]
+            if not force and any(field in producer.produces for producer in producers):
+                return 'wait'
+        
+        return None
+    
+    def _source_timeout(self, crawler: BaseCrawler) -> float:
+        return crawler.timeout or get_settings().CRAWLER_TIMEOUT_SECONDS
+    
+    async def _safe_crawl(
+        self,
+        crawler: BaseCrawler,
+        query: str,
+        query_type: str,
+        timeout: float,
+        sink: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Safely execute crawler with error handling and a time limit
+        
+        Fields the crawler publishes before finishing are passed to `sink`.
+        
+        The call is skipped if the source's circuit breaker rejects it.
+        A crawl fails, for the source's circuit breaker, if it raises, times
+        out, or any of its fetches was blocked or errored. A crawl whose only
+        problem was fetches dropped by the per-site rate limit (see
+        services.politeness) leaves the breaker unchanged.
+        """
+        breaker = circuit_breakers.get(crawler.source_name) if crawler.circuit_breaker else None
+        generation = breaker.allow() if breaker else None
+        if breaker and generation is None:
+            logger.info(f"Skipping {crawler.source_name} for {query}: circuit open")
             return None
+        
+        failures = []
+        fetch_failures.set(failures)
+        partial_results.set(sink)
+        started = time.monotonic()
+        fetch_deadline.set(started + timeout)
+        result = None
+        finished = False
+        # Admission and settlement share this try so that cancellation at
+        # any point gives a half-open probe back
+        try:
+            try:
+                result = await asyncio.wait_for(crawler.crawl(query, query_type), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{crawler.source_name} timed out after {timeout:.1f}s for {query}")
+                failures.append('timeout')
+            except Exception as e:
+                logger.error(f"Error in {crawler.source_name}: {str(e)}")
+                failures.append(type(e).__name__)
+            finished = True
+        finally:
+            if breaker:
+                errors = [reason for reason in failures if reason != THROTTLED]
+                if finished and (errors or THROTTLED not in failures):
+                    breaker.record(generation, not errors, time.monotonic() - started)
+                else:
+                    breaker.release(generation)
+        return result
     
     def _merge_data(self, base: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,96 @@
+from bs4 import BeautifulSoup, FeatureNotFound
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from core.config import get_settings
+from collections import OrderedDict
+from typing import Any, Callable
+import asyncio
+import copy
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_PARSER = 'html.parser'
+
+def make_soup(html: str) -> BeautifulSoup:
+    """
+    Parse HTML with the configured backend, falling back to html.parser
+    if the backend is unavailable or rejects the document
+    """
+    parser = get_settings().HTML_PARSER_BACKEND
+    if parser != FALLBACK_PARSER:
+        try:
+            return BeautifulSoup(html, parser)
+        except FeatureNotFound:
+            logger.warning(f"HTML parser backend '{parser}' not installed, using {FALLBACK_PARSER}")
+        except Exception as e:
+            logger.warning(f"HTML parser backend '{parser}' failed ({str(e)}), using {FALLBACK_PARSER}")
+    
+    return BeautifulSoup(html, FALLBACK_PARSER)
+
+class HTMLParserPool:
+    """Bounded worker pool that keeps HTML parsing off the event loop"""
+    executor: Executor = None
+
+    @classmethod
+    def start(cls):
+        """Create the pool (thread or process, per HTML_PARSE_EXECUTOR)"""
+        settings = get_settings()
+        if settings.HTML_PARSE_EXECUTOR == 'process':
+            cls.executor = ProcessPoolExecutor(max_workers=settings.HTML_PARSE_WORKERS)
+        else:
+            cls.executor = ThreadPoolExecutor(
+                max_workers=settings.HTML_PARSE_WORKERS,
+                thread_name_prefix='html-parse'
+            )
+        logger.info(
+            f"Started HTML parser pool ({settings.HTML_PARSE_EXECUTOR}, "
+            f"workers={settings.HTML_PARSE_WORKERS}, backend={settings.HTML_PARSER_BACKEND})"
+        )
+
+    @classmethod
+    def close(cls):
+        """Shut the pool down"""
+        if cls.executor:
+            cls.executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Stopped HTML parser pool")
+        cls.executor = None
+
+    @classmethod
+    def get_executor(cls) -> Executor:
+        """Get the pool, creating it on first use"""
+        if cls.executor is None:
+            cls.start()
+        return cls.executor
+
+html_parser_pool = HTMLParserPool()
+
+# Extraction results keyed by (function, document digest, extra args), so an
+# unchanged page (e.g. served from the HTTP cache on a 304) is not re-parsed
+_parse_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+async def parse_in_pool(func: Callable[..., Any], html: str, *args) -> Any:
+    """
+    Run an extraction function over `html` in the parser pool
+    
+    `func` and its arguments must be picklable when the process executor
+    is configured (module-level functions or methods of picklable objects).
+    Results are memoized in a small LRU and returned as copies.
+    """
+    cache_size = get_settings().HTML_PARSE_CACHE_SIZE
+    key = None
+    if cache_size > 0:
+        digest = hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        key = (func.__qualname__, digest, args)
+        if key in _parse_cache:
+            _parse_cache.move_to_end(key)
+            return copy.deepcopy(_parse_cache[key])
+    
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(html_parser_pool.get_executor(), func, html, *args)
+    
+    if key is not None:
+        _parse_cache[key] = copy.deepcopy(result)
+        while len(_parse_cache) > cache_size:
+            _parse_cache.popitem(last=False)
+    return result
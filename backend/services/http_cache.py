@@ -0,0 +1,104 @@
+from core.config import get_settings
+from core.database import get_db
+from bson.binary import Binary
+from typing import Optional, Dict, Any
+from datetime import datetime, timezone, timedelta
+import aiohttp
+import logging
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+class HTTPResponseCache:
+    """
+    Validator-based response cache for crawler fetches, stored in http_cache.
+    
+    Bodies are kept zstd-compressed together with their ETag/Last-Modified so
+    recrawls can send a conditional request and reuse the body on a 304.
+    """
+    
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+    
+    @property
+    def collection(self):
+        return get_db().http_cache
+    
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached entry for a URL, if it is still within HTTP_CACHE_TTL_DAYS
+        """
+        settings = get_settings()
+        if not settings.HTTP_CACHE_ENABLED:
+            return None
+        
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.HTTP_CACHE_TTL_DAYS)
+        try:
+            return await self.collection.find_one(
+                {"url": url, "stored_at": {"$gte": cutoff}},
+                {"_id": 0}
+            )
+        except Exception as e:
+            logger.warning(f"HTTP cache lookup failed for {url}: {str(e)}")
+            return None
+    
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Validators to send with a recrawl of a cached URL
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def body(self, entry: Dict[str, Any]) -> bytes:
+        """
+        Decompressed body of a cached entry
+        """
+        return self._decompressor.decompress(entry['body'])
+    
+    async def store(self, url: str, response: aiohttp.ClientResponse, body: bytes):
+        """
+        Cache a 200 response body if the server supplied validators
+        """
+        settings = get_settings()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not settings.HTTP_CACHE_ENABLED or not (etag or last_modified):
+            return
+        
+        try:
+            await self.collection.update_one(
+                {"url": url},
+                {
+                    "$set": {
+                        "url": url,
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "charset": response.charset,
+                        "body": Binary(self._compressor.compress(body)),
+                        "stored_at": datetime.now(timezone.utc)
+                    }
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"HTTP cache store failed for {url}: {str(e)}")
+    
+    async def touch(self, url: str):
+        """
+        Extend the lifetime of an entry the server confirmed unchanged
+        """
+        try:
+            await self.collection.update_one(
+                {"url": url},
+                {"$set": {"stored_at": datetime.now(timezone.utc)}}
+            )
+        except Exception as e:
+            logger.warning(f"HTTP cache refresh failed for {url}: {str(e)}")
+
+http_cache = HTTPResponseCache()
@@ -0,0 +1,41 @@
+from typing import Optional
+import re
+
+_WHITESPACE = re.compile(r'\s+')
+_SCHEME = re.compile(r'^[a-z][a-z0-9+.-]*://', re.IGNORECASE)
+
+def normalize_input_value(input_type: str, value) -> Optional[str]:
+    """
+    Normalize a raw crawl input to its canonical form
+    
+    Returns:
+        Canonical value, or None if the input is blank
+    """
+    if value is None:
+        return None
+    
+    value = _WHITESPACE.sub(' ', str(value)).strip()
+    if not value or value.lower() in ('nan', 'none', 'null'):
+        return None
+    
+    if input_type == 'domain':
+        value = _SCHEME.sub('', value.lower())
+        value = re.split(r'[/?#]', value, maxsplit=1)[0]
+        value = value.split(':')[0].rstrip('.')
+        if value.startswith('www.'):
+            value = value[4:]
+        return value or None
+    
+    if input_type == 'linkedin_url':
+        value = value.split('?')[0].split('#')[0].rstrip('/')
+        if not _SCHEME.match(value):
+            value = f"https://{value}"
+        return value.lower()
+    
+    return value
+
+def input_key(input_type: str, value: str) -> str:
+    """
+    Case-insensitive identity of a normalized input, used for deduplication
+    """
+    return f"{input_type}:{value.casefold()}"
@@ -1,8 +1,7 @@
 from services.base_crawler import BaseCrawler
+from services.html_parser import make_soup, parse_in_pool
 from typing import Optional, Dict, Any
 import logging
-import aiohttp
-from bs4 import BeautifulSoup
 import re
 
 logger = logging.getLogger(__name__)
@@ -10,11 +9,9 @@ logger = logging.getLogger(__name__)
 class LinkedInCrawler(BaseCrawler):
     """Crawler for extracting data from LinkedIn company pages"""
     
-    def __init__(self):
-        super().__init__()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    consumes = ['linkedin_url', 'company_name', 'domain']
+    produces = ['linkedin_url', 'company_name']
+    timeout = 6.0
     
     async def crawl(self, query: str, query_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -41,17 +38,13 @@ class LinkedInCrawler(BaseCrawler):
             # In production, use LinkedIn API or premium data providers
             # This is a simplified implementation
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(linkedin_url, headers=self.headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
-                        logger.warning(f"Failed to fetch LinkedIn {linkedin_url}: {response.status}")
-                        return None
-                    
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    data = self._extract_linkedin_data(soup, linkedin_url)
-                    return data
+            # Only the <head> is used, so stop reading once it is complete
+            html = await self.fetch_html(linkedin_url, stop_after=b'</head>')
+            if html is None:
+                return None
+            
+            data = await parse_in_pool(self._extract_linkedin_data, html, linkedin_url)
+            return data
         
         except Exception as e:
             logger.error(f"Error crawling LinkedIn {query}: {str(e)}")
@@ -60,7 +53,10 @@ class LinkedInCrawler(BaseCrawler):
     def _search_linkedin(self, company_name: str) -> Optional[str]:
         """Generate LinkedIn company URL from name"""
         # Simplified - in production use LinkedIn API
-        slug = company_name.lower().replace(' ', '-').replace(',', '')
+        # Keep only URL-safe words so '&' or '#' cannot cut the path short
+        slug = '-'.join(re.findall(r'[a-z0-9]+', company_name.lower()))
+        if not slug:
+            return None
         return f"https://www.linkedin.com/company/{slug}"
     
     async def _find_linkedin_from_domain(self, domain: str) -> Optional[str]:
@@ -68,8 +64,9 @@ class LinkedInCrawler(BaseCrawler):
         # This would typically involve searching or using a database
         return None
     
-    def _extract_linkedin_data(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
-        """Extract data from LinkedIn page"""
+    def _extract_linkedin_data(self, html: str, url: str) -> Dict[str, Any]:
+        """Extract data from LinkedIn page (runs in the parser pool)"""
+        soup = make_soup(html)
         data = {
             'linkedin_url': url
         }
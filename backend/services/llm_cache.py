@@ -0,0 +1,90 @@
+from core.config import get_settings
+from core.database import get_db
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone, timedelta
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM completions, keyed by a hash of (model, prompt).
+
+    Lookups go to an in-process LRU first and then to the llm_cache
+    collection, whose TTL index on expires_at (see core.indexes) drops
+    entries after LLM_CACHE_TTL_DAYS. Prompts are whitespace-normalized
+    before hashing.
+    """
+
+    def __init__(self):
+        self._memory: "OrderedDict[str, Tuple[datetime, str]]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+    @property
+    def collection(self):
+        return get_db().llm_cache
+
+    def key(self, model: str, messages: List[Dict[str, str]]) -> str:
+        prompt = [(m["role"], " ".join(m["content"].split())) for m in messages]
+        payload = json.dumps([model, prompt], separators=(',', ':'))
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        settings = get_settings()
+        if not settings.LLM_CACHE_ENABLED:
+            return None
+
+        now = datetime.now(timezone.utc)
+        cached = self._memory.get(key)
+        if cached and cached[0] > now:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return cached[1]
+
+        try:
+            entry = await self.collection.find_one(
+                {"key": key, "expires_at": {"$gt": now}},
+                {"_id": 0, "content": 1, "expires_at": 1}
+            )
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            entry = None
+
+        if entry:
+            self.stats["db_hits"] += 1
+            expires_at = entry["expires_at"]
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self._remember(key, expires_at, entry["content"])
+            return entry["content"]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def store(self, key: str, model: str, content: str):
+        settings = get_settings()
+        if not settings.LLM_CACHE_ENABLED or not content:
+            return
+
+        expires_at = datetime.now(timezone.utc) + timedelta(days=settings.LLM_CACHE_TTL_DAYS)
+        self._remember(key, expires_at, content)
+
+        try:
+            await self.collection.update_one(
+                {"key": key},
+                {"$set": {"key": key, "model": model, "content": content, "expires_at": expires_at}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {str(e)}")
+
+    def _remember(self, key: str, expires_at: datetime, content: str):
+        self._memory[key] = (expires_at, content)
+        self._memory.move_to_end(key)
+        while len(self._memory) > get_settings().LLM_CACHE_MAX_ENTRIES:
+            self._memory.popitem(last=False)
+
+llm_cache = LLMResponseCache()
@@ -0,0 +1,86 @@
+from difflib import SequenceMatcher
+from typing import List, Optional
+from urllib.parse import urlparse, unquote
+import re
+import unicodedata
+
+LEGAL_SUFFIXES = re.compile(
+    r'\b(Inc|LLC|Ltd|Limited|Corporation|Corp|Company|Co|GmbH|PLC|Pvt|LLP|SA|AG)\b\.?', re.IGNORECASE
+)
+LINKEDIN_PAGE_TYPES = ('company', 'school', 'showcase', 'in')
+
+# Scores at or beyond these bounds are decided locally; the band between
+# them is left to the LLM
+CONFIDENT_MATCH = 0.85
+CONFIDENT_MISMATCH = 0.3
+
+def _tokens(text: str) -> List[str]:
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    text = LEGAL_SUFFIXES.sub(' ', text.replace('&', ' and '))
+    return [token for token in re.split(r'[^a-z0-9]+', text.lower()) if token]
+
+def linkedin_slug(url: str) -> Optional[str]:
+    """
+    Page slug of a LinkedIn URL (e.g. 'acme-labs' for /company/acme-labs/)
+    """
+    parsed = urlparse(url if '://' in url else f"https://{url}")
+    host = (parsed.hostname or '').lower()
+    if host != 'linkedin.com' and not host.endswith('.linkedin.com'):
+        return None
+
+    parts = [unquote(part) for part in parsed.path.split('/') if part]
+    if len(parts) >= 2 and parts[0].lower() in LINKEDIN_PAGE_TYPES:
+        return parts[1]
+    return None
+
+def score_linkedin_match(url: str, company_name: str) -> float:
+    """
+    Deterministic confidence that a LinkedIn URL belongs to a company
+
+    Compares the URL slug with the company name after stripping accents,
+    legal suffixes and trailing numeric ids: exact and token-set matches,
+    acronyms, containment, token overlap and edit-distance similarity.
+
+    Returns:
+        Confidence score (0.0 to 1.0); see CONFIDENT_MATCH/CONFIDENT_MISMATCH
+    """
+    slug = linkedin_slug(url)
+    if slug is None:
+        return 0.0
+
+    slug_tokens = _tokens(slug)
+    # LinkedIn disambiguates duplicate names with numeric suffixes
+    while len(slug_tokens) > 1 and slug_tokens[-1].isdigit():
+        slug_tokens.pop()
+    name_tokens = _tokens(company_name)
+    if not slug_tokens or not name_tokens:
+        return 0.0
+
+    slug_compact = ''.join(slug_tokens)
+    name_compact = ''.join(name_tokens)
+    if slug_compact == name_compact or set(slug_tokens) == set(name_tokens):
+        return 1.0
+
+    if len(name_tokens) >= 2:
+        acronym = ''.join(token[0] for token in name_tokens)
+        if slug_compact == acronym:
+            return 0.9
+
+    overlap = len(set(slug_tokens) & set(name_tokens)) / len(set(slug_tokens) | set(name_tokens))
+    similarity = SequenceMatcher(None, slug_compact, name_compact).ratio()
+
+    (shorter, _), (longer, longer_tokens) = sorted(
+        ((slug_compact, slug_tokens), (name_compact, name_tokens)), key=lambda pair: len(pair[0])
+    )
+    if len(shorter) >= 4 and longer.startswith(shorter):
+        # 'acme' vs 'Acme Labs' ends on a word; 'micro' vs 'Microsoft' does
+        # not and stays ambiguous
+        boundaries = {len(''.join(longer_tokens[:i])) for i in range(1, len(longer_tokens))}
+        if len(shorter) in boundaries:
+            return CONFIDENT_MATCH
+        return round(min(max(overlap, similarity, 0.6), CONFIDENT_MATCH - 0.05), 3)
+
+    return round(max(overlap, similarity), 3)
+
+def is_confident(score: float) -> bool:
+    return score >= CONFIDENT_MATCH or score <= CONFIDENT_MISMATCH
@@ -1,20 +1,18 @@
 from services.base_crawler import BaseCrawler
+from services.html_parser import make_soup, parse_in_pool
 from typing import Optional, Dict, Any, List
 import logging
-import aiohttp
-from bs4 import BeautifulSoup
 from datetime import datetime, timezone
+from urllib.parse import quote_plus
 
 logger = logging.getLogger(__name__)
 
 class NewsCrawler(BaseCrawler):
     """Crawler for fetching latest company news"""
     
-    def __init__(self):
-        super().__init__()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    consumes = ['company_name']
+    produces = ['latest_news']
+    timeout = 6.0
     
     async def crawl(self, query: str, query_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -49,30 +47,32 @@ class NewsCrawler(BaseCrawler):
         try:
             # Google News RSS or search
             # Simplified implementation
-            search_url = f"https://news.google.com/search?q={company_name}&hl=en-US&gl=US&ceid=US:en"
+            search_url = f"https://news.google.com/search?q={quote_plus(company_name)}&hl=en-US&gl=US&ceid=US:en"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, headers=self.headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
-                        return []
-                    
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Extract news items (structure may vary)
-                    news_items = []
-                    articles = soup.find_all('article', limit=5)
-                    
-                    for article in articles:
-                        title_elem = article.find('h3')
-                        if title_elem:
-                            news_items.append({
-                                'title': title_elem.get_text().strip(),
-                                'date': datetime.now(timezone.utc).isoformat()
-                            })
-                    
-                    return news_items
+            html = await self.fetch_html(search_url)
+            if html is None:
+                return []
+            
+            return await parse_in_pool(self._extract_news_items, html)
         
         except Exception as e:
             logger.error(f"Error fetching Google News: {str(e)}")
             return []
+    
+    def _extract_news_items(self, html: str) -> List[Dict[str, Any]]:
+        """Extract news items from a results page (runs in the parser pool)"""
+        soup = make_soup(html)
+        
+        # Extract news items (structure may vary)
+        news_items = []
+        articles = soup.find_all('article', limit=5)
+        
+        for article in articles:
+            title_elem = article.find('h3')
+            if title_elem:
+                news_items.append({
+                    'title': title_elem.get_text().strip(),
+                    'date': datetime.now(timezone.utc)
+                })
+        
+        return news_items
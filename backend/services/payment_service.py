@@ -37,14 +37,12 @@ class PaymentService:
         for plan in plans:
             existing = await self.plans.find_one({"name": plan.name})
             if not existing:
-                plan_dict = plan.model_dump()
-                plan_dict['created_at'] = plan_dict['created_at'].isoformat()
-                await self.plans.insert_one(plan_dict)
+                await self.plans.insert_one(plan.model_dump())
     
     async def get_plans(self) -> List[Plan]:
         """Get all active plans"""
         plans_list = await self.plans.find({"is_active": True}, {"_id": 0}).to_list(100)
-        return [Plan(**{**p, 'created_at': datetime.fromisoformat(p['created_at']) if isinstance(p['created_at'], str) else p['created_at']}) for p in plans_list]
+        return [Plan(**p) for p in plans_list]
     
     async def create_order(self, user_id: str, order_data: OrderCreate) -> Transaction:
         """
@@ -71,10 +69,7 @@ class PaymentService:
                 status="pending"
             )
             
-            transaction_dict = transaction.model_dump()
-            transaction_dict['created_at'] = transaction_dict['created_at'].isoformat()
-            
-            await self.transactions.insert_one(transaction_dict)
+            await self.transactions.insert_one(transaction.model_dump())
             
             logger.info(f"Created order for user {user_id}: {transaction.id}")
             return transaction
@@ -108,7 +103,7 @@ class PaymentService:
                         "razorpay_payment_id": verification.razorpay_payment_id,
                         "razorpay_signature": verification.razorpay_signature,
                         "status": "completed",
-                        "completed_at": datetime.now(timezone.utc).isoformat()
+                        "completed_at": datetime.now(timezone.utc)
                     }
                 }
             )
@@ -130,9 +125,4 @@ class PaymentService:
         if not trans_dict:
             return None
         
-        # Convert timestamps
-        for field in ['created_at', 'completed_at']:
-            if trans_dict.get(field) and isinstance(trans_dict[field], str):
-                trans_dict[field] = datetime.fromisoformat(trans_dict[field])
-        
         return Transaction(**trans_dict)
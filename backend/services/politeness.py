@@ -0,0 +1,184 @@
+from core.config import get_settings
+from core.http_client import http_client, read_capped, decode_body
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_MAX_BYTES = 512 * 1024
+MAX_IDLE_BUCKETS = 10000
+
+# time.monotonic() by which the crawl running in this context must finish;
+# set by CrawlerOrchestrator so a fetch does not queue past its budget
+fetch_deadline: ContextVar[Optional[float]] = ContextVar('fetch_deadline', default=None)
+
+class ThrottledError(Exception):
+    """The site's turn would come only after the caller's deadline"""
+
+class TokenBucket:
+    """Token bucket pacing requests to a single site"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self, deadline: Optional[float] = None):
+        """
+        Wait for a token; waiters are served in FIFO order
+        
+        A token is reserved up front (the balance goes negative while
+        callers queue), so the wait is known before sleeping. Raises
+        ThrottledError, without reserving, if it would end after `deadline`.
+        """
+        self._refill()
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        if deadline is not None and time.monotonic() + wait > deadline:
+            raise ThrottledError(f"next slot in {wait:.1f}s is past the deadline")
+        
+        self.tokens -= 1
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.tokens += 1
+                raise
+    
+    def is_idle(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+class PolitenessScheduler:
+    """
+    Per-site request pacing and robots.txt enforcement for crawler fetches.
+    
+    Each site (registrable domain, so subdomains share a budget) gets its own
+    token bucket. Waiting happens before a connection is taken from the
+    shared HTTP pool, so a throttled site never holds a global slot.
+    """
+    
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.robots: "OrderedDict[str, Tuple[Optional[RobotFileParser], float]]" = OrderedDict()
+        self._robots_fetches: Dict[str, asyncio.Task] = {}
+        self._rate_overrides: Optional[Dict[str, float]] = None
+    
+    async def wait_turn(self, url: str):
+        """
+        Block until the site of `url` may be requested again
+        
+        Raises ThrottledError if that is after the crawl's fetch_deadline.
+        """
+        await self._bucket(site_key(urlparse(url).hostname or '')).acquire(fetch_deadline.get())
+    
+    async def is_allowed(self, url: str, user_agent: str) -> bool:
+        """Check the cached robots.txt of the URL's origin"""
+        if not get_settings().ROBOTS_RESPECT:
+            return True
+        
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        parser = await self._get_robots(origin)
+        return parser is None or parser.can_fetch(user_agent, url)
+    
+    def _bucket(self, site: str) -> TokenBucket:
+        bucket = self.buckets.get(site)
+        if bucket is None:
+            if len(self.buckets) >= MAX_IDLE_BUCKETS:
+                self._prune_buckets()
+            settings = get_settings()
+            rate = self._rate_for(site)
+            bucket = TokenBucket(rate, max(1.0, settings.HOST_BURST))
+            self.buckets[site] = bucket
+        return bucket
+    
+    def _prune_buckets(self):
+        for site in [site for site, bucket in self.buckets.items() if bucket.is_idle()]:
+            del self.buckets[site]
+    
+    def _rate_for(self, site: str) -> float:
+        """Requests per second for a site, honouring HOST_RATE_OVERRIDES"""
+        settings = get_settings()
+        if self._rate_overrides is None:
+            self._rate_overrides = {}
+            for entry in filter(None, settings.HOST_RATE_OVERRIDES.split(',')):
+                host, _, rate = entry.partition('=')
+                self._rate_overrides[site_key(host.strip().lower())] = float(rate)
+        return self._rate_overrides.get(site, settings.HOST_RATE_PER_SECOND)
+    
+    async def _get_robots(self, origin: str) -> Optional[RobotFileParser]:
+        cached = self.robots.get(origin)
+        if cached and cached[1] > time.monotonic():
+            self.robots.move_to_end(origin)
+            return cached[0]
+        
+        # Coalesce concurrent fetches of the same robots.txt
+        task = self._robots_fetches.get(origin)
+        if task is None:
+            task = asyncio.create_task(self._fetch_robots(origin))
+            self._robots_fetches[origin] = task
+            task.add_done_callback(lambda _: self._robots_fetches.pop(origin, None))
+        return await asyncio.shield(task)
+    
+    async def _fetch_robots(self, origin: str) -> Optional[RobotFileParser]:
+        """
+        Fetch and cache robots.txt; a missing file allows everything and a
+        failed fetch is treated as allow-all for a shorter period
+        """
+        settings = get_settings()
+        ttl = settings.ROBOTS_CACHE_TTL_SECONDS
+        parser = None
+        
+        try:
+            await self.wait_turn(origin)
+            async with http_client.get_session().get(f"{origin}/robots.txt", allow_redirects=True) as response:
+                if response.status == 200:
+                    body = await read_capped(response, ROBOTS_MAX_BYTES)
+                    parser = RobotFileParser()
+                    parser.parse(decode_body(body, response.charset).splitlines())
+                    self._apply_crawl_delay(origin, parser)
+                elif response.status >= 500:
+                    ttl = min(ttl, 300)
+        except ThrottledError:
+            # Not a verdict on the site; let the next caller try again
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to fetch robots.txt for {origin}: {str(e)}")
+            ttl = min(ttl, 300)
+        
+        self.robots[origin] = (parser, time.monotonic() + ttl)
+        self.robots.move_to_end(origin)
+        while len(self.robots) > settings.ROBOTS_CACHE_MAX_ENTRIES:
+            self.robots.popitem(last=False)
+        return parser
+    
+    def _apply_crawl_delay(self, origin: str, parser: RobotFileParser):
+        """Slow a site's bucket down to its robots.txt Crawl-delay"""
+        delay = parser.crawl_delay('*')
+        if delay:
+            bucket = self._bucket(site_key(urlparse(origin).hostname or ''))
+            bucket.rate = min(bucket.rate, 1 / float(delay))
+
+def site_key(hostname: str) -> str:
+    """
+    Approximate registrable domain: last two labels, or three for
+    two-letter country domains with a short second level (e.g. co.uk)
+    """
+    labels = hostname.lower().rstrip('.').split('.')
+    if len(labels) >= 3 and len(labels[-1]) == 2 and len(labels[-2]) <= 3:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+politeness = PolitenessScheduler()
@@ -1,10 +1,10 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from models.user import User, UserCreate, UserLogin
 from core.auth import get_password_hash, verify_password, create_access_token
 from typing import Optional
 import logging
 from fastapi import HTTPException, status
-from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,6 @@ class UserService:
         # Hash password and store
         user_dict = user.model_dump()
         user_dict['hashed_password'] = get_password_hash(user_data.password)
-        user_dict['created_at'] = user_dict['created_at'].isoformat()
         
         await self.collection.insert_one(user_dict)
         
@@ -71,9 +70,6 @@ class UserService:
             )
         
         # Convert to User model
-        if isinstance(user_dict['created_at'], str):
-            user_dict['created_at'] = datetime.fromisoformat(user_dict['created_at'])
-        
         user = User(**{k: v for k, v in user_dict.items() if k != 'hashed_password' and k != '_id'})
         
         # Create token
@@ -92,9 +88,6 @@ class UserService:
         if not user_dict:
             return None
         
-        if isinstance(user_dict['created_at'], str):
-            user_dict['created_at'] = datetime.fromisoformat(user_dict['created_at'])
-        
         return User(**user_dict)
     
     async def update_credits(self, user_id: str, credits_delta: int) -> bool:
@@ -111,5 +104,34 @@ class UserService:
         """
         Get user's current credits
         """
-        user = await self.get_user(user_id)
-        return user.credits if user else 0
+        user_dict = await self.collection.find_one({"id": user_id}, {"_id": 0, "credits": 1})
+        return user_dict.get('credits', 0) if user_dict else 0
+    
+    async def reserve_credits(self, user_id: str, amount: int) -> int:
+        """
+        Atomically claim up to `amount` credits in a single conditional update
+        
+        Returns:
+            Number of credits actually reserved (0 if the balance is empty)
+        """
+        if amount <= 0:
+            return 0
+        
+        before = await self.collection.find_one_and_update(
+            {"id": user_id, "credits": {"$gt": 0}},
+            [{"$set": {"credits": {"$max": [{"$subtract": ["$credits", amount]}, 0]}}}],
+            projection={"_id": 0, "credits": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not before:
+            return 0
+        
+        return min(before['credits'], amount)
+    
+    async def release_credits(self, user_id: str, amount: int) -> bool:
+        """
+        Refund previously reserved credits that were not consumed
+        """
+        if amount <= 0:
+            return False
+        return await self.update_credits(user_id, amount)
@@ -1,21 +1,46 @@
 from services.base_crawler import BaseCrawler
-from typing import Optional, Dict, Any
-import logging
+from services.html_parser import make_soup, parse_in_pool
+from services.contact_extractor import extract_contacts, MAX_EMAILS, MAX_PHONES
+from services.politeness import politeness
+from services.name_matcher import LEGAL_SUFFIXES
+from core.config import get_settings
+from typing import Optional, Dict, Any, List, Tuple
 import aiohttp
-from bs4 import BeautifulSoup
+import asyncio
+import logging
 import re
 from urllib.parse import urljoin, urlparse
 
 logger = logging.getLogger(__name__)
 
+# Internal pages likely to hold contacts, addresses and people, best first
+PRIORITY_PATHS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'contact', r'about', r'team|people|leadership|founders', r'company', r'impressum|imprint'
+    )
+]
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.mp4')
+
+# Page titles read like "Acme | Home & More"; only one part is the name
+TITLE_SEPARATORS = re.compile(r'\s+[-–—]\s+|\s*[|·•»]\s*|:\s+')
+GENERIC_TITLE_PARTS = {'home', 'homepage', 'home page', 'welcome', 'official site', 'official website'}
+
 class WebsiteCrawler(BaseCrawler):
     """Crawler for extracting data from company websites"""
     
-    def __init__(self):
-        super().__init__()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    consumes = ['domain', 'company_name']
+    produces = [
+        'domain', 'company_name', 'description', 'linkedin_url', 'twitter_url',
+        'facebook_url', 'emails', 'phone_numbers', 'website_urls'
+    ]
+    
+    # Domain discovery plus internal pages need more than a single fetch, but
+    # this must stay below the crawl stage budget (CRAWL_DEADLINE_SECONDS
+    # minus the AI reserve) for the timeout to ever fire
+    timeout = 10.0
+    # Every query targets a different site, so one dead domain says nothing
+    # about the next
+    circuit_breaker = False
     
     async def crawl(self, query: str, query_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -25,75 +50,239 @@ class WebsiteCrawler(BaseCrawler):
             if query_type == 'domain':
                 url = f"https://{query}" if not query.startswith('http') else query
             elif query_type == 'company_name':
-                # For company name, we'll try to construct a domain
-                domain = self._company_name_to_domain(query)
-                url = f"https://{domain}"
+                # For company name, probe plausible domains and take the most likely live one
+                url = await self._discover_domain(query)
+                if not url:
+                    logger.info(f"No live domain found for {query}")
+                    return None
             else:
                 return None
             
             logger.info(f"Crawling website: {url}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
-                        logger.warning(f"Failed to fetch {url}: {response.status}")
-                        return None
-                    
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    data = self._extract_data_from_html(soup, url)
-                    return data
+            html = await self.fetch_html(url)
+            if html is None:
+                return None
+            
+            data, frontier = await parse_in_pool(self._extract_homepage, html, url)
+            
+            # Let the other sources start on the homepage's name and links
+            # while the internal pages are fetched
+            self.publish(dict(data))
+            
+            if frontier:
+                for page_data in await self._crawl_frontier(frontier):
+                    self._merge_page_data(data, page_data)
+            
+            return data
         
         except Exception as e:
             logger.error(f"Error crawling website {query}: {str(e)}")
             return None
     
-    def _company_name_to_domain(self, company_name: str) -> str:
-        """Convert company name to potential domain"""
-        # Remove common suffixes
-        name = re.sub(r'\b(Inc|LLC|Ltd|Corporation|Corp|Company|Co)\b', '', company_name, flags=re.IGNORECASE)
-        # Convert to lowercase and replace spaces with nothing or hyphens
-        domain = name.strip().lower().replace(' ', '')
-        return f"{domain}.com"
+    def _candidate_domains(self, company_name: str) -> List[str]:
+        """
+        Generate plausible domains for a company name, most likely first:
+        the suffix-stripped name, joined and hyphenated, across
+        DOMAIN_CANDIDATE_TLDS, then the full name on .com
+        """
+        settings = get_settings()
+        
+        def variants(name: str) -> List[str]:
+            words = re.findall(r'[a-z0-9]+', name.lower().replace('&', ' and '))
+            if not words:
+                return []
+            return list(dict.fromkeys([''.join(words), '-'.join(words)]))
+        
+        tlds = [tld.strip().lstrip('.') for tld in settings.DOMAIN_CANDIDATE_TLDS.split(',') if tld.strip()]
+        candidates = [
+            f"{variant}.{tld}"
+            for tld in tlds
+            for variant in variants(LEGAL_SUFFIXES.sub(' ', company_name))
+        ]
+        candidates += [f"{variant}.com" for variant in variants(company_name)]
+        
+        return list(dict.fromkeys(candidates))[:settings.DOMAIN_CANDIDATE_MAX]
+    
+    async def _discover_domain(self, company_name: str) -> Optional[str]:
+        """
+        Probe candidate domains concurrently with HEAD requests
+        
+        Returns:
+            URL of the highest-ranked candidate that answers (after
+            redirects), or None. Once one has answered, higher-ranked probes
+            still running get DOMAIN_PROBE_GRACE_SECONDS before the best
+            answer so far is taken.
+        """
+        settings = get_settings()
+        timeout = aiohttp.ClientTimeout(total=settings.DOMAIN_PROBE_TIMEOUT)
+        
+        async def probe(domain: str) -> Optional[str]:
+            url = f"https://{domain}"
+            try:
+                await politeness.wait_turn(url)
+                async with self.session.head(url, headers=self.headers, allow_redirects=True, timeout=timeout) as response:
+                    # Some servers (or bot protection in front of them) reject
+                    # HEAD but still exist
+                    if response.status < 400 or response.status in (403, 405):
+                        return str(response.url.with_path('/').with_query(None))
+            except Exception:
+                pass
+            return None
+        
+        tasks = [asyncio.create_task(probe(domain)) for domain in self._candidate_domains(company_name)]
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        grace_ends = None
+        try:
+            # Probes run concurrently, but a hit is taken as soon as every
+            # higher-ranked candidate has failed, so a fast parked .io cannot
+            # beat the real .com; a hung .com only holds it for the grace window
+            while pending:
+                wait = None if grace_ends is None else max(0.0, grace_ends - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                
+                hits = [task.result() for task in tasks if task.done() and task.result()]
+                for task in tasks:
+                    if not task.done():
+                        break
+                    if task.result():
+                        return task.result()
+                
+                if hits and not done:
+                    return hits[0]
+                if hits and grace_ends is None:
+                    grace_ends = loop.time() + settings.DOMAIN_PROBE_GRACE_SECONDS
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _crawl_frontier(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch high-value internal pages concurrently, at most
+        WEBSITE_CRAWL_DOMAIN_CONCURRENCY at a time for the site
+        """
+        semaphore = asyncio.Semaphore(get_settings().WEBSITE_CRAWL_DOMAIN_CONCURRENCY)
+        
+        async def fetch_page(url: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    html = await self.fetch_html(url)
+                    if html is None:
+                        return None
+                    return await parse_in_pool(self._extract_subpage, html)
+                except Exception as e:
+                    logger.warning(f"Error crawling page {url}: {str(e)}")
+                    return None
+        
+        results = await asyncio.gather(*(fetch_page(url) for url in urls))
+        pages = []
+        for url, page_data in zip(urls, results):
+            if page_data is not None:
+                page_data['website_urls'] = [url]
+                pages.append(page_data)
+        return pages
+    
+    def _merge_page_data(self, data: Dict[str, Any], page_data: Dict[str, Any]):
+        """
+        Merge contacts found on an internal page into the homepage data
+        """
+        limits = {'emails': MAX_EMAILS, 'phone_numbers': MAX_PHONES, 'website_urls': None}
+        for key, value in page_data.items():
+            if key in limits:
+                merged = data.get(key, []) + [v for v in value if v not in data.get(key, [])]
+                data[key] = merged[:limits[key]] if limits[key] else merged
+            elif not data.get(key):
+                data[key] = value
+    
+    def _extract_homepage(self, html: str, url: str) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Extract homepage data and pick the internal pages worth fetching
+        (runs in the parser pool)
+        """
+        hrefs: List[str] = []
+        data = self._extract_data_from_html(html, url, hrefs)
+        return data, self._select_frontier(hrefs, url)
+    
+    def _extract_subpage(self, html: str) -> Dict[str, Any]:
+        """Extract contacts from an internal page (runs in the parser pool)"""
+        return extract_contacts(make_soup(html))
+    
+    def _select_frontier(self, hrefs: List[str], base_url: str) -> List[str]:
+        """
+        Rank same-site links by PRIORITY_PATHS, keeping at most
+        WEBSITE_CRAWL_MAX_PAGES - 1 (the homepage counts against the budget)
+        """
+        budget = get_settings().WEBSITE_CRAWL_MAX_PAGES - 1
+        if budget <= 0:
+            return []
+        
+        base = urlparse(base_url)
+        site = base.netloc.lower().removeprefix('www.')
+        # Normalized path -> (URL to fetch, rank); /Contact, /contact/ and
+        # /contact#form are one page and take one slot of the budget
+        ranked: Dict[str, Tuple[str, int]] = {}
+        
+        for href in hrefs:
+            link = urlparse(urljoin(base_url, href.strip()))
+            if link.scheme not in ('http', 'https') or link.netloc.lower().removeprefix('www.') != site:
+                continue
+            
+            path = link.path.rstrip('/')
+            key = path.lower()
+            if not key or key == base.path.rstrip('/').lower() or key.endswith(SKIPPED_EXTENSIONS):
+                continue
+            
+            for rank, pattern in enumerate(PRIORITY_PATHS):
+                if pattern.search(path):
+                    # Fetch from the homepage's origin, keeping the first spelling seen
+                    page, best = ranked.get(key, (f"{base.scheme}://{base.netloc}{path}", rank))
+                    ranked[key] = (page, min(rank, best))
+                    break
+        
+        ordered = sorted(ranked.values(), key=lambda entry: (entry[1], len(entry[0])))
+        return [page for page, _ in ordered[:budget]]
+    
+    def _name_from_title(self, title: str, domain: str) -> Optional[str]:
+        """
+        Pick the company name out of a page title: the part matching the
+        domain if any, else the first part that is not generic ("Home")
+        """
+        parts = [part.strip() for part in TITLE_SEPARATORS.split(title) if part.strip()]
+        parts = [part for part in parts if part.lower() not in GENERIC_TITLE_PARTS]
+        if not parts:
+            return None
+        
+        label = re.sub(r'[^a-z0-9]', '', domain.split('.')[0].lower())
+        for part in parts:
+            if label and re.sub(r'[^a-z0-9]', '', part.lower()) == label:
+                return part
+        return parts[0]
     
-    def _extract_data_from_html(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
-        """Extract company data from HTML"""
+    def _extract_data_from_html(self, html: str, url: str, hrefs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Extract company data from HTML (runs in the parser pool)"""
+        soup = make_soup(html)
         data = {
             'domain': urlparse(url).netloc.replace('www.', ''),
             'website_urls': [url]
         }
         
-        # Extract title as potential company name
-        if soup.title:
-            data['company_name'] = soup.title.string.strip()
+        # Company name from og:site_name, else the name part of the title
+        site_name = soup.find('meta', attrs={'property': 'og:site_name'})
+        if site_name and site_name.get('content', '').strip():
+            data['company_name'] = site_name.get('content').strip()
+        elif soup.title and soup.title.string:
+            name = self._name_from_title(soup.title.string, data['domain'])
+            if name:
+                data['company_name'] = name
         
         # Extract meta description
         meta_desc = soup.find('meta', attrs={'name': 'description'})
         if meta_desc and meta_desc.get('content'):
             data['description'] = meta_desc.get('content').strip()
         
-        # Try to find contact info
-        text_content = soup.get_text()
-        
-        # Find emails
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text_content)
-        if emails:
-            data['emails'] = list(set(emails))[:5]  # Limit to 5 unique emails
-        
-        # Find phone numbers
-        phones = re.findall(r'\b(?:\+?1[-.]?)?\(?([0-9]{3})\)?[-.]?([0-9]{3})[-.]?([0-9]{4})\b', text_content)
-        if phones:
-            data['phone_numbers'] = [f"+1-{p[0]}-{p[1]}-{p[2]}" for p in phones[:3]]
-        
-        # Try to find LinkedIn
-        linkedin_links = soup.find_all('a', href=re.compile(r'linkedin\.com/company/'))
-        if linkedin_links:
-            data['linkedin_url'] = linkedin_links[0].get('href')
-        
-        # Try to find Twitter
-        twitter_links = soup.find_all('a', href=re.compile(r'twitter\.com/'))
-        if twitter_links:
-            data['twitter_url'] = twitter_links[0].get('href')
+        # Contacts and social profiles in a single pass
+        data.update(extract_contacts(soup, hrefs))
         
         return data